@@ -3,7 +3,7 @@
 use crate::agents::parser::{Capabilities, ModelTier, ParsedAgent};
 
 /// Target platform for agent compilation
-#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
 pub enum Platform {
     /// Claude Code format
     ClaudeCode,
@@ -2,10 +2,11 @@
 
 use crate::agents::compiler::{compile_agent, CompiledAgent, Platform};
 use crate::agents::parser::parse_agent_md;
-use crate::core::infra::{Checksum, FileSystem};
-use crate::core::types::Result;
+use crate::core::infra::{has_marker_file, Checksum, FileSystem};
+use crate::core::types::{Error, Result};
 use std::collections::HashMap;
 use std::path::{Path, PathBuf};
+use std::sync::Mutex;
 
 /// Status of an agent
 #[derive(Debug, Clone, PartialEq, Eq)]
@@ -76,14 +77,22 @@ impl AgentsUpdateDiff {
 }
 
 /// Computes diffs between source agents and installed compiled agents
+///
+/// Each source agent is read, parsed and compiled at most once per platform;
+/// `compile_from_source` reuses what `compute_diff` already compiled.
 pub struct AgentDiffer<'a, F: FileSystem, C: Checksum> {
     fs: &'a F,
     checksum: &'a C,
+    compiled: Mutex<HashMap<(PathBuf, Platform), CompiledAgent>>,
 }
 
 impl<'a, F: FileSystem, C: Checksum> AgentDiffer<'a, F, C> {
     pub fn new(fs: &'a F, checksum: &'a C) -> Self {
-        Self { fs, checksum }
+        Self {
+            fs,
+            checksum,
+            compiled: Mutex::new(HashMap::new()),
+        }
     }
 
     /// Compute diff between source agents and installed agents
@@ -187,8 +196,7 @@ impl<'a, F: FileSystem, C: Checksum> AgentDiffer<'a, F, C> {
         let entries = self.fs.list_dir(dir).await?;
 
         for entry in entries {
-            let agent_md = entry.join("AGENT.md");
-            if self.fs.is_dir(&entry) && self.fs.exists(&agent_md) {
+            if has_marker_file(self.fs, &entry, "AGENT.md") {
                 agents.push(entry);
             }
         }
@@ -225,41 +233,108 @@ impl<'a, F: FileSystem, C: Checksum> AgentDiffer<'a, F, C> {
         target_path: &Path,
         platform: Platform,
     ) -> Result<bool> {
-        // Read and parse source agent
-        let agent_md_path = source_path.join("AGENT.md");
-        let content = self.fs.read(&agent_md_path).await?;
-        let parsed = parse_agent_md(&content, agent_md_path.clone())?;
-
-        // Compile to get expected content
-        let compiled = compile_agent(&parsed, platform);
+        // Compile source agent to get expected content
+        let compiled = self.compile_from_source(source_path, platform).await?;
 
-        // Compare compiled content with target file
-        if self.fs.exists(target_path) {
-            let source_hash = self.checksum.sha256(compiled.content.as_bytes());
-            let target_hash = self.checksum.sha256_file(target_path)?;
-            Ok(source_hash != target_hash)
-        } else {
+        // Compare compiled content with target file, letting the open report
+        // a missing target rather than checking for it first
+        let target_hash = match self.checksum.sha256_file(target_path) {
+            Ok(hash) => hash,
             // Target doesn't exist = changed
-            Ok(true)
-        }
+            Err(Error::Io(e)) if e.kind() == std::io::ErrorKind::NotFound => return Ok(true),
+            Err(e) => return Err(e),
+        };
+        let source_hash = self.checksum.sha256(compiled.content.as_bytes());
+        Ok(source_hash != target_hash)
     }
 
-    /// Compile an agent from source
+    /// Compile an agent from source, reusing an earlier compilation
     pub async fn compile_from_source(
         &self,
         source_path: &Path,
         platform: Platform,
     ) -> Result<CompiledAgent> {
+        let key = (source_path.to_path_buf(), platform);
+        let cached = self.compiled.lock().unwrap().get(&key).cloned();
+        if let Some(compiled) = cached {
+            return Ok(compiled);
+        }
+
         let agent_md_path = source_path.join("AGENT.md");
         let content = self.fs.read(&agent_md_path).await?;
         let parsed = parse_agent_md(&content, agent_md_path)?;
-        Ok(compile_agent(&parsed, platform))
+        let compiled = compile_agent(&parsed, platform);
+
+        self.compiled.lock().unwrap().insert(key, compiled.clone());
+        Ok(compiled)
     }
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::infra::{Sha2Checksum, StdFileSystem};
+    use tempfile::TempDir;
+
+    const AGENT_MD: &str = r#"---
+name: test-agent
+description: A test agent for testing
+---
+
+You are a test agent.
+"#;
+
+    #[tokio::test]
+    async fn test_compile_from_source_reuses_diff_compilation() {
+        let temp_dir = TempDir::new().unwrap();
+        let source_dir = temp_dir.path().join("agents");
+        let target_dir = temp_dir.path().join("installed");
+        let agent_dir = source_dir.join("test-agent");
+        std::fs::create_dir_all(&agent_dir).unwrap();
+        std::fs::create_dir_all(&target_dir).unwrap();
+        std::fs::write(agent_dir.join("AGENT.md"), AGENT_MD).unwrap();
+        std::fs::write(target_dir.join("test-agent.md"), "outdated").unwrap();
+
+        let fs = StdFileSystem::new();
+        let checksum = Sha2Checksum::new();
+        let differ = AgentDiffer::new(&fs, &checksum);
+
+        let diff = differ
+            .compute_diff(&source_dir, &target_dir, Platform::ClaudeCode)
+            .await
+            .unwrap();
+        assert_eq!(diff.modified_agents_count(), 1);
+
+        // The source is not read again once it has been compiled
+        std::fs::remove_file(agent_dir.join("AGENT.md")).unwrap();
+        let compiled = differ
+            .compile_from_source(&agent_dir, Platform::ClaudeCode)
+            .await
+            .unwrap();
+        assert!(compiled.content.contains("You are a test agent."));
+    }
+
+    #[tokio::test]
+    async fn test_compare_agent_content_missing_target() {
+        let temp_dir = TempDir::new().unwrap();
+        let agent_dir = temp_dir.path().join("test-agent");
+        std::fs::create_dir_all(&agent_dir).unwrap();
+        std::fs::write(agent_dir.join("AGENT.md"), AGENT_MD).unwrap();
+
+        let fs = StdFileSystem::new();
+        let checksum = Sha2Checksum::new();
+        let differ = AgentDiffer::new(&fs, &checksum);
+
+        let changed = differ
+            .compare_agent_content(
+                &agent_dir,
+                &temp_dir.path().join("missing.md"),
+                Platform::ClaudeCode,
+            )
+            .await
+            .unwrap();
+        assert!(changed);
+    }
 
     #[test]
     fn test_agents_update_diff_counts() {
@@ -1,7 +1,7 @@
 //! Agent discovery - find agents in .aiassisted/agents/
 
 use crate::agents::compiler::Platform;
-use crate::core::infra::FileSystem;
+use crate::core::infra::{has_marker_file, FileSystem};
 use crate::core::types::Result;
 use std::path::{Path, PathBuf};
 
@@ -60,9 +60,8 @@ impl<'a, F: FileSystem> AgentDiscovery<'a, F> {
         let entries = self.fs.list_dir(&source_dir).await?;
 
         for entry in entries {
-            let agent_md = entry.join("AGENT.md");
-
-            if self.fs.is_dir(&entry) && self.fs.exists(&agent_md) {
+            if has_marker_file(self.fs, &entry, "AGENT.md") {
+                let agent_md = entry.join("AGENT.md");
                 let name = entry
                     .file_name()
                     .and_then(|n| n.to_str())
@@ -181,6 +180,14 @@ mod tests {
         async fn copy(&self, _from: &Path, _to: &Path) -> Result<()> {
             Ok(())
         }
+
+        async fn rename(&self, _from: &Path, _to: &Path) -> Result<()> {
+            Ok(())
+        }
+
+        async fn remove_dir_all(&self, _path: &Path) -> Result<()> {
+            Ok(())
+        }
     }
 
     #[test]
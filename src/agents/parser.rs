@@ -102,21 +102,17 @@ pub struct ParsedAgent {
 
 /// Parse AGENT.md content into structured data
 pub fn parse_agent_md(content: &str, source_path: PathBuf) -> Result<ParsedAgent> {
-    // Split content by --- delimiters
-    let parts: Vec<&str> = content.splitn(3, "---").collect();
-
-    if parts.len() < 3 {
-        return Err(Error::Parse(
-            "AGENT.md must have YAML frontmatter delimited by ---".to_string(),
-        ));
-    }
-
-    // parts[0] is empty (before first ---)
-    // parts[1] is the YAML frontmatter
-    // parts[2] is the markdown body
-
-    let yaml_content = parts[1].trim();
-    let markdown_body = parts[2].trim();
+    // Split content by --- delimiters: the text before the first one is
+    // ignored, then comes the YAML frontmatter and the markdown body
+    let (yaml_content, markdown_body) = content
+        .split_once("---")
+        .and_then(|(_, rest)| rest.split_once("---"))
+        .ok_or_else(|| {
+            Error::Parse("AGENT.md must have YAML frontmatter delimited by ---".to_string())
+        })?;
+
+    let yaml_content = yaml_content.trim();
+    let markdown_body = markdown_body.trim();
 
     // Parse YAML frontmatter
     let raw: RawFrontmatter =
@@ -197,6 +193,14 @@ System prompt here.
         assert!(result.is_err());
     }
 
+    #[test]
+    fn test_parse_unterminated_frontmatter() {
+        let content = "---\nname: test-agent\ndescription: Missing closing delimiter\n";
+
+        let result = parse_agent_md(content, PathBuf::from("/test/AGENT.md"));
+        assert!(result.is_err());
+    }
+
     #[test]
     fn test_parse_invalid_yaml() {
         let content = r#"---
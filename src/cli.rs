@@ -81,6 +81,10 @@ pub struct CheckArgs {
     /// Target directory path
     #[arg(short, long, default_value = ".")]
     pub path: PathBuf,
+
+    /// Fetch the remote manifest even if a recent copy is cached
+    #[arg(long)]
+    pub no_cache: bool,
 }
 
 /// Arguments for the setup-skills command.
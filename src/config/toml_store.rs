@@ -114,6 +114,8 @@ mod tests {
             async fn create_dir_all(&self, path: &Path) -> Result<()>;
             async fn list_dir(&self, path: &Path) -> Result<Vec<PathBuf>>;
             async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn remove_dir_all(&self, path: &Path) -> Result<()>;
         }
     }
 
@@ -0,0 +1,385 @@
+//! On-disk cache of the remote manifest.
+//!
+//! `check` only needs to know whether the remote manifest changed, so the
+//! last fetched copy is kept in the user cache directory and reused while
+//! it is fresh instead of going back to GitHub on every run. Once it goes
+//! stale it is revalidated with its `ETag` rather than downloaded again.
+
+use std::path::PathBuf;
+
+use serde::{Deserialize, Serialize};
+
+use crate::core::infra::{FileSystem, HttpClient};
+use crate::core::types::{Error, FetchResult, Result};
+
+use super::manifest::Manifest;
+
+/// How long a cached remote manifest is served without refetching (1 hour).
+pub const MANIFEST_CACHE_TTL_SECS: i64 = 60 * 60;
+
+/// Cache file name inside the user cache directory.
+const CACHE_FILE: &str = "remote-manifest.json";
+
+/// Remote manifest as stored in the cache file.
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct CachedManifest {
+    /// URL the manifest was fetched from.
+    pub url: String,
+    /// Unix timestamp (seconds) of the fetch.
+    pub fetched_at: i64,
+    /// `ETag` the server sent with the manifest, used to revalidate it.
+    #[serde(default, skip_serializing_if = "Option::is_none")]
+    pub etag: Option<String>,
+    /// The manifest as fetched.
+    pub manifest: Manifest,
+}
+
+impl CachedManifest {
+    /// Check whether this entry is younger than `ttl_secs` at time `now`.
+    pub fn is_fresh(&self, now: i64, ttl_secs: i64) -> bool {
+        (0..ttl_secs).contains(&(now - self.fetched_at))
+    }
+}
+
+/// Cache for the remote manifest, stored as a single JSON file.
+#[derive(Debug, Clone)]
+pub struct ManifestCache {
+    path: PathBuf,
+    ttl_secs: i64,
+}
+
+impl ManifestCache {
+    /// Create a cache backed by the file at `path`.
+    pub fn new(path: PathBuf) -> Self {
+        Self {
+            path,
+            ttl_secs: MANIFEST_CACHE_TTL_SECS,
+        }
+    }
+
+    /// Create a cache in the user cache directory
+    /// (`<cache dir>/aiassisted/remote-manifest.json`).
+    pub fn default_location() -> Option<Self> {
+        dirs::cache_dir().map(|dir| Self::new(dir.join("aiassisted").join(CACHE_FILE)))
+    }
+
+    /// Set how long a cached manifest is served without asking the server.
+    /// `0` always revalidates.
+    pub fn with_ttl(mut self, ttl_secs: i64) -> Self {
+        self.ttl_secs = ttl_secs;
+        self
+    }
+
+    /// Read the cache entry for `url`, treating any problem as a miss.
+    pub async fn load<F: FileSystem>(&self, fs: &F, url: &str) -> Option<CachedManifest> {
+        let content = fs.read(&self.path).await.ok()?;
+        let cached: CachedManifest = serde_json::from_str(&content).ok()?;
+        (cached.url == url).then_some(cached)
+    }
+
+    /// Store a freshly fetched (or revalidated) manifest for `url`.
+    pub async fn store<F: FileSystem>(
+        &self,
+        fs: &F,
+        url: &str,
+        etag: Option<String>,
+        manifest: &Manifest,
+    ) -> Result<()> {
+        let cached = CachedManifest {
+            url: url.to_string(),
+            fetched_at: chrono::Utc::now().timestamp(),
+            etag,
+            manifest: manifest.clone(),
+        };
+        let content =
+            serde_json::to_string(&cached).map_err(|e| Error::Serialization(e.to_string()))?;
+        fs.write(&self.path, &content).await
+    }
+
+    /// Load the remote manifest, serving a fresh cached copy if there is one.
+    ///
+    /// A stale copy is revalidated with [`ManifestCache::revalidate`].
+    pub async fn fetch<F, H>(&self, fs: &F, http: &H, url: &str) -> Result<Manifest>
+    where
+        F: FileSystem,
+        H: HttpClient,
+    {
+        let cached = self.load(fs, url).await;
+        if let Some(cached) = &cached {
+            let now = chrono::Utc::now().timestamp();
+            if cached.is_fresh(now, self.ttl_secs) {
+                return Ok(cached.manifest.clone());
+            }
+        }
+
+        self.refresh(fs, http, url, cached).await
+    }
+
+    /// Load the remote manifest from the server, ignoring the TTL.
+    ///
+    /// The cached `ETag` is sent as `If-None-Match`, so an unchanged manifest
+    /// costs a `304` with no body. Either way the cache is refreshed; failing
+    /// to write it is not an error.
+    pub async fn revalidate<F, H>(&self, fs: &F, http: &H, url: &str) -> Result<Manifest>
+    where
+        F: FileSystem,
+        H: HttpClient,
+    {
+        let cached = self.load(fs, url).await;
+        self.refresh(fs, http, url, cached).await
+    }
+
+    async fn refresh<F, H>(
+        &self,
+        fs: &F,
+        http: &H,
+        url: &str,
+        cached: Option<CachedManifest>,
+    ) -> Result<Manifest>
+    where
+        F: FileSystem,
+        H: HttpClient,
+    {
+        let etag = cached.as_ref().and_then(|c| c.etag.as_deref());
+        let (manifest, etag) = match http.get_conditional(url, etag).await? {
+            FetchResult::Modified { body, etag } => (Manifest::from_json(&body)?, etag),
+            FetchResult::NotModified => match cached {
+                Some(cached) => (cached.manifest, cached.etag),
+                // We only send an ETag we have a cached body for
+                None => return Err(Error::Network(format!("Unexpected 304 for {}", url))),
+            },
+        };
+
+        let _ = self.store(fs, url, etag, &manifest).await;
+        Ok(manifest)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::core::types::ManifestEntry;
+    use mockall::mock;
+    use std::path::Path;
+
+    mock! {
+        pub FileSystem {}
+
+        #[async_trait::async_trait]
+        impl crate::core::infra::FileSystem for FileSystem {
+            async fn read(&self, path: &Path) -> Result<String>;
+            async fn write(&self, path: &Path, content: &str) -> Result<()>;
+            fn exists(&self, path: &Path) -> bool;
+            fn is_dir(&self, path: &Path) -> bool;
+            fn is_file(&self, path: &Path) -> bool;
+            async fn create_dir_all(&self, path: &Path) -> Result<()>;
+            async fn list_dir(&self, path: &Path) -> Result<Vec<PathBuf>>;
+            async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn remove_dir_all(&self, path: &Path) -> Result<()>;
+        }
+    }
+
+    mock! {
+        pub HttpClient {}
+
+        #[async_trait::async_trait]
+        impl crate::core::infra::HttpClient for HttpClient {
+            async fn get(&self, url: &str) -> Result<String>;
+            async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
+            async fn get_conditional(&self, url: &str, etag: Option<&str>) -> Result<FetchResult>;
+            async fn download(&self, url: &str, dest: &Path) -> Result<String>;
+        }
+    }
+
+    const URL: &str = "https://example.com/manifest.json";
+    const REMOTE_JSON: &str = r#"{"version":"2.0.0","files":[]}"#;
+
+    fn cached_json(url: &str, fetched_at: i64) -> String {
+        let cached = CachedManifest {
+            url: url.to_string(),
+            fetched_at,
+            etag: Some("\"v1\"".to_string()),
+            manifest: Manifest {
+                version: "1.0.0".to_string(),
+                files: vec![ManifestEntry {
+                    path: PathBuf::from("file1.txt"),
+                    checksum: "abc123".to_string(),
+                }],
+            },
+        };
+        serde_json::to_string(&cached).unwrap()
+    }
+
+    fn modified(etag: &str) -> FetchResult {
+        FetchResult::Modified {
+            body: REMOTE_JSON.to_string(),
+            etag: Some(etag.to_string()),
+        }
+    }
+
+    #[test]
+    fn test_is_fresh() {
+        let cached = CachedManifest {
+            url: URL.to_string(),
+            fetched_at: 1_000,
+            etag: None,
+            manifest: Manifest {
+                version: "1.0.0".to_string(),
+                files: vec![],
+            },
+        };
+
+        assert!(cached.is_fresh(1_000, 60));
+        assert!(cached.is_fresh(1_059, 60));
+        assert!(!cached.is_fresh(1_060, 60));
+        // A timestamp in the future means the clock moved; don't trust it
+        assert!(!cached.is_fresh(999, 60));
+    }
+
+    #[tokio::test]
+    async fn test_fetch_uses_fresh_cache() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let now = chrono::Utc::now().timestamp();
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json(URL, now)));
+        mock_http.expect_get_conditional().times(0);
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json"));
+        let manifest = cache.fetch(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "1.0.0");
+        assert_eq!(manifest.files.len(), 1);
+    }
+
+    #[tokio::test]
+    async fn test_fetch_refreshes_stale_cache() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let stale = chrono::Utc::now().timestamp() - MANIFEST_CACHE_TTL_SECS - 1;
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json(URL, stale)));
+        mock_http
+            .expect_get_conditional()
+            .withf(|_, etag| *etag == Some("\"v1\""))
+            .times(1)
+            .returning(|_, _| Ok(modified("\"v2\"")));
+        mock_fs
+            .expect_write()
+            .withf(|_, content: &str| content.contains("v2"))
+            .times(1)
+            .returning(|_, _| Ok(()));
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json"));
+        let manifest = cache.fetch(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "2.0.0");
+    }
+
+    #[tokio::test]
+    async fn test_fetch_not_modified_reuses_cached_manifest() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let stale = chrono::Utc::now().timestamp() - MANIFEST_CACHE_TTL_SECS - 1;
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json(URL, stale)));
+        mock_http
+            .expect_get_conditional()
+            .times(1)
+            .returning(|_, _| Ok(FetchResult::NotModified));
+        // The entry is re-stamped so the next run is served from the cache
+        mock_fs
+            .expect_write()
+            .withf(|_, content: &str| content.contains("v1") && content.contains("1.0.0"))
+            .times(1)
+            .returning(|_, _| Ok(()));
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json"));
+        let manifest = cache.fetch(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "1.0.0");
+        assert_eq!(manifest.files.len(), 1);
+    }
+
+    #[tokio::test]
+    async fn test_fetch_ignores_cache_for_other_url() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let now = chrono::Utc::now().timestamp();
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json("https://other.example/manifest.json", now)));
+        mock_http
+            .expect_get_conditional()
+            .withf(|_, etag| etag.is_none())
+            .times(1)
+            .returning(|_, _| Ok(modified("\"v2\"")));
+        mock_fs.expect_write().times(1).returning(|_, _| Ok(()));
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json"));
+        let manifest = cache.fetch(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "2.0.0");
+    }
+
+    #[tokio::test]
+    async fn test_revalidate_ignores_ttl() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let now = chrono::Utc::now().timestamp();
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json(URL, now)));
+        mock_http
+            .expect_get_conditional()
+            .withf(|_, etag| *etag == Some("\"v1\""))
+            .times(1)
+            .returning(|_, _| Ok(modified("\"v2\"")));
+        // A failed cache write must not fail the fetch
+        mock_fs
+            .expect_write()
+            .times(1)
+            .returning(|_, _| Err(Error::Io(std::io::Error::other("read-only"))));
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json"));
+        let manifest = cache.revalidate(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "2.0.0");
+    }
+
+    #[tokio::test]
+    async fn test_fetch_with_zero_ttl_revalidates() {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let now = chrono::Utc::now().timestamp();
+
+        mock_fs
+            .expect_read()
+            .times(1)
+            .returning(move |_| Ok(cached_json(URL, now)));
+        mock_http
+            .expect_get_conditional()
+            .times(1)
+            .returning(|_, _| Ok(FetchResult::NotModified));
+        mock_fs.expect_write().times(1).returning(|_, _| Ok(()));
+
+        let cache = ManifestCache::new(PathBuf::from("/cache/remote-manifest.json")).with_ttl(0);
+        let manifest = cache.fetch(&mock_fs, &mock_http, URL).await.unwrap();
+
+        assert_eq!(manifest.version, "1.0.0");
+    }
+}
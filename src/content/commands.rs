@@ -5,6 +5,7 @@ use std::path::PathBuf;
 use crate::core::infra::{Checksum, FileSystem, HttpClient, Logger};
 use crate::core::types::Result;
 
+use super::cache::ManifestCache;
 use super::sync;
 
 /// Install command - installs .aiassisted to a target directory.
@@ -32,7 +33,8 @@ impl InstallCommand {
             self.path.display()
         ));
 
-        sync::install(fs, http, checksum, logger, &self.path).await
+        let cache = ManifestCache::default_location();
+        sync::install(fs, http, checksum, logger, &self.path, cache.as_ref()).await
     }
 }
 
@@ -63,13 +65,25 @@ impl UpdateCommand {
             if self.force { " (forced)" } else { "" }
         ));
 
-        sync::update(fs, http, checksum, logger, &self.path, self.force).await
+        let cache = ManifestCache::default_location();
+        sync::update(
+            fs,
+            http,
+            checksum,
+            logger,
+            &self.path,
+            self.force,
+            cache.as_ref(),
+        )
+        .await
     }
 }
 
 /// Check command - checks for updates without downloading.
 pub struct CheckCommand {
     pub path: PathBuf,
+    /// Ignore the cached remote manifest and fetch a fresh one.
+    pub no_cache: bool,
 }
 
 impl CheckCommand {
@@ -85,6 +99,8 @@ impl CheckCommand {
             self.path.display()
         ));
 
-        sync::check(fs, http, logger, &self.path).await
+        let cache = ManifestCache::default_location()
+            .map(|cache| if self.no_cache { cache.with_ttl(0) } else { cache });
+        sync::check(fs, http, logger, &self.path, cache.as_ref()).await
     }
 }
@@ -1,16 +1,30 @@
 //! GitHub API utilities for downloading .aiassisted content.
 
-use std::path::{Path, PathBuf};
+use std::collections::HashMap;
+use std::io::Read;
+use std::path::{Component, Path, PathBuf};
 
-use crate::core::infra::{Checksum, FileSystem, HttpClient};
+use flate2::read::GzDecoder;
+use futures::stream::{self, StreamExt, TryStreamExt};
+
+use crate::core::infra::{par_chunks, Checksum, FileSystem, HttpClient};
 use crate::core::types::{Error, ManifestEntry, Result};
 
 /// Base URL for raw GitHub content.
 pub const GITHUB_RAW_BASE: &str = "https://raw.githubusercontent.com/rstlix0x0/aiassisted/main";
 
+/// URL of the gzipped tarball of the whole repository at `main`.
+pub const GITHUB_TARBALL_URL: &str = "https://codeload.github.com/rstlix0x0/aiassisted/tar.gz/main";
+
 /// Manifest file path relative to repository root.
 pub const MANIFEST_PATH: &str = ".aiassisted/manifest.json";
 
+/// Maximum number of files downloaded at the same time.
+pub const MAX_CONCURRENT_DOWNLOADS: usize = 8;
+
+/// Largest buffer reserved up front for a single archive entry.
+const MAX_ENTRY_PREALLOC: u64 = 16 << 20;
+
 /// Get the full URL for the manifest file.
 pub fn manifest_url() -> String {
     format!("{}/{}", GITHUB_RAW_BASE, MANIFEST_PATH)
@@ -38,8 +52,24 @@ where
     C: Checksum,
     F: FileSystem,
 {
-    let url = content_url(&entry.path);
     let dest_path = dest_dir.join(".aiassisted").join(&entry.path);
+    write_verified_file(http, checksum, fs, entry, &dest_path).await
+}
+
+/// Download a single file to `dest_path` and verify its checksum.
+async fn write_verified_file<H, C, F>(
+    http: &H,
+    checksum: &C,
+    fs: &F,
+    entry: &ManifestEntry,
+    dest_path: &Path,
+) -> Result<()>
+where
+    H: HttpClient,
+    C: Checksum,
+    F: FileSystem,
+{
+    let url = content_url(&entry.path);
 
     // Download content
     let content = http.get(&url).await?;
@@ -59,12 +89,16 @@ where
     }
 
     // Write file
-    fs.write(&dest_path, &content).await?;
+    fs.write(dest_path, &content).await?;
 
     Ok(())
 }
 
 /// Download multiple files in batch.
+///
+/// Up to [`MAX_CONCURRENT_DOWNLOADS`] files are in flight at once, so the
+/// batch takes roughly `ceil(n / MAX_CONCURRENT_DOWNLOADS)` round-trips
+/// instead of `n`. The first failure aborts the remaining downloads.
 pub async fn download_batch<H, C, F>(
     http: &H,
     checksum: &C,
@@ -77,14 +111,129 @@ where
     C: Checksum,
     F: FileSystem,
 {
-    let mut downloaded = Vec::new();
+    let root = &dest_dir.join(".aiassisted");
+    stream::iter(entries)
+        .map(|entry| async move {
+            let dest_path = root.join(&entry.path);
+            write_verified_file(http, checksum, fs, entry, &dest_path).await?;
+            Ok::<_, Error>(dest_path)
+        })
+        .buffered(MAX_CONCURRENT_DOWNLOADS)
+        .try_collect()
+        .await
+}
 
-    for entry in entries {
-        download_file(http, checksum, fs, entry, dest_dir).await?;
-        downloaded.push(dest_dir.join(".aiassisted").join(&entry.path));
+/// Download all files in `entries` from the repository tarball.
+///
+/// The whole tree arrives in a single request instead of one request per
+/// file. Every entry must be present in the archive and match its checksum
+/// (verified in parallel); nothing is written until all of them have been.
+pub async fn download_tarball<H, C, F>(
+    http: &H,
+    checksum: &C,
+    fs: &F,
+    entries: &[ManifestEntry],
+    dest_dir: &Path,
+) -> Result<Vec<PathBuf>>
+where
+    H: HttpClient,
+    C: Checksum,
+    F: FileSystem,
+{
+    let archive = http.get_bytes(GITHUB_TARBALL_URL).await?;
+    let mut contents = extract_aiassisted(&archive)?;
+
+    let files = entries
+        .iter()
+        .map(|entry| {
+            let content = contents.remove(&entry.path).ok_or_else(|| {
+                Error::NotFound(format!("{} not found in archive", entry.path.display()))
+            })?;
+            Ok((entry, content))
+        })
+        .collect::<Result<Vec<_>>>()?;
+
+    verify_checksums(checksum, &files)?;
+
+    let root = dest_dir.join(".aiassisted");
+    let files: Vec<_> = files
+        .into_iter()
+        .map(|(entry, content)| (root.join(&entry.path), content))
+        .collect();
+
+    for (dest_path, content) in &files {
+        if let Some(parent) = dest_path.parent() {
+            fs.create_dir_all(parent).await?;
+        }
+        fs.write(dest_path, content).await?;
     }
 
-    Ok(downloaded)
+    Ok(files.into_iter().map(|(path, _)| path).collect())
+}
+
+/// Check every `(entry, content)` pair against the entry's checksum.
+///
+/// Hashing is CPU-bound and the pairs are independent, so they are split
+/// into one chunk per core and verified on scoped threads.
+fn verify_checksums<C: Checksum>(checksum: &C, files: &[(&ManifestEntry, String)]) -> Result<()> {
+    let verify = |(entry, content): &(&ManifestEntry, String)| {
+        let actual_checksum = checksum.sha256(content.as_bytes());
+        if actual_checksum != entry.checksum {
+            return Err(Error::ChecksumMismatch {
+                expected: entry.checksum.clone(),
+                actual: actual_checksum,
+            });
+        }
+        Ok(())
+    };
+
+    par_chunks(files, verify).into_iter().collect()
+}
+
+/// Read the files under `<top-level dir>/.aiassisted/` out of a `.tar.gz`.
+///
+/// Returns the file contents keyed by their path relative to `.aiassisted`.
+fn extract_aiassisted(archive: &[u8]) -> Result<HashMap<PathBuf, String>> {
+    let mut tar = tar::Archive::new(GzDecoder::new(archive));
+    let mut contents = HashMap::new();
+
+    for entry in tar.entries()? {
+        let mut entry = entry?;
+        if !entry.header().entry_type().is_file() {
+            continue;
+        }
+
+        let Some(relative) = aiassisted_relative_path(&entry.path()?) else {
+            continue;
+        };
+
+        // Size the buffer from the header so the entry is decompressed in a
+        // few large reads rather than a doubling series of small ones
+        // (capped, since the header is untrusted until the data is read)
+        let size_hint = entry.size().min(MAX_ENTRY_PREALLOC) as usize;
+        let mut content = String::with_capacity(size_hint);
+        entry.read_to_string(&mut content)?;
+        contents.insert(relative, content);
+    }
+
+    Ok(contents)
+}
+
+/// Map `<top-level dir>/.aiassisted/<rest>` to `<rest>`.
+///
+/// Anything outside `.aiassisted`, or trying to escape it, yields `None`.
+fn aiassisted_relative_path(path: &Path) -> Option<PathBuf> {
+    let mut components = path.components();
+    components.next()?;
+    if components.next()? != Component::Normal(".aiassisted".as_ref()) {
+        return None;
+    }
+
+    let rest = components.as_path();
+    let is_plain = rest
+        .components()
+        .all(|component| matches!(component, Component::Normal(_)));
+    (is_plain && !rest.as_os_str().is_empty()).then(|| rest.to_path_buf())
 }
 
 #[cfg(test)]
@@ -101,7 +250,7 @@ mod tests {
         impl crate::core::infra::HttpClient for HttpClient {
             async fn get(&self, url: &str) -> Result<String>;
             async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
-            async fn download(&self, url: &str, dest: &Path) -> Result<()>;
+            async fn download(&self, url: &str, dest: &Path) -> Result<String>;
         }
     }
 
@@ -127,6 +276,8 @@ mod tests {
             async fn create_dir_all(&self, path: &Path) -> Result<()>;
             async fn list_dir(&self, path: &Path) -> Result<Vec<PathBuf>>;
             async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn remove_dir_all(&self, path: &Path) -> Result<()>;
         }
     }
 
@@ -404,6 +555,180 @@ mod tests {
         assert!(result.is_err());
     }
 
+    /// Build a `.tar.gz` in memory from `(path, content)` pairs.
+    fn tarball(files: &[(&str, &str)]) -> Vec<u8> {
+        let encoder = flate2::write::GzEncoder::new(Vec::new(), flate2::Compression::default());
+        let mut tar = tar::Builder::new(encoder);
+        for (path, content) in files {
+            let mut header = tar::Header::new_gnu();
+            header.set_path(path).unwrap();
+            header.set_size(content.len() as u64);
+            header.set_mode(0o644);
+            header.set_cksum();
+            tar.append(&header, content.as_bytes()).unwrap();
+        }
+        tar.into_inner().unwrap().finish().unwrap()
+    }
+
+    #[test]
+    fn test_aiassisted_relative_path() {
+        assert_eq!(
+            aiassisted_relative_path(Path::new("aiassisted-main/.aiassisted/guidelines/a.md")),
+            Some(PathBuf::from("guidelines/a.md"))
+        );
+        assert_eq!(
+            aiassisted_relative_path(Path::new("aiassisted-main/src/main.rs")),
+            None
+        );
+        assert_eq!(
+            aiassisted_relative_path(Path::new("aiassisted-main/.aiassisted/../src/main.rs")),
+            None
+        );
+        assert_eq!(aiassisted_relative_path(Path::new("aiassisted-main/.aiassisted")), None);
+    }
+
+    #[tokio::test]
+    async fn test_download_tarball_success() {
+        let temp_dir = TempDir::new().unwrap();
+        let entries = vec![
+            ManifestEntry {
+                path: PathBuf::from("file1.txt"),
+                checksum: "checksum-one".to_string(),
+            },
+            ManifestEntry {
+                path: PathBuf::from("nested/file2.txt"),
+                checksum: "checksum-two".to_string(),
+            },
+        ];
+        let archive = tarball(&[
+            ("aiassisted-main/README.md", "not installed"),
+            ("aiassisted-main/.aiassisted/file1.txt", "one"),
+            ("aiassisted-main/.aiassisted/nested/file2.txt", "two"),
+        ]);
+
+        let mut mock_http = MockHttpClient::new();
+        let mut mock_checksum = MockChecksum::new();
+        let mut mock_fs = MockFileSystem::new();
+
+        mock_http
+            .expect_get_bytes()
+            .with(eq(GITHUB_TARBALL_URL))
+            .times(1)
+            .return_once(move |_| Ok(archive));
+        mock_http.expect_get().times(0);
+
+        mock_checksum
+            .expect_sha256()
+            .times(2)
+            .returning(|content| format!("checksum-{}", String::from_utf8_lossy(content)));
+
+        mock_fs
+            .expect_create_dir_all()
+            .times(2)
+            .returning(|_| Ok(()));
+        mock_fs
+            .expect_write()
+            .withf(|path: &Path, content: &str| {
+                (path.ends_with("file1.txt") && content == "one")
+                    || (path.ends_with("nested/file2.txt") && content == "two")
+            })
+            .times(2)
+            .returning(|_, _| Ok(()));
+
+        let downloaded = download_tarball(
+            &mock_http,
+            &mock_checksum,
+            &mock_fs,
+            &entries,
+            temp_dir.path(),
+        )
+        .await
+        .unwrap();
+
+        assert_eq!(
+            downloaded,
+            vec![
+                temp_dir.path().join(".aiassisted/file1.txt"),
+                temp_dir.path().join(".aiassisted/nested/file2.txt"),
+            ]
+        );
+    }
+
+    #[tokio::test]
+    async fn test_download_tarball_missing_file_writes_nothing() {
+        let temp_dir = TempDir::new().unwrap();
+        let entries = vec![
+            ManifestEntry {
+                path: PathBuf::from("file1.txt"),
+                checksum: "checksum-one".to_string(),
+            },
+            ManifestEntry {
+                path: PathBuf::from("missing.txt"),
+                checksum: "checksum-missing".to_string(),
+            },
+        ];
+        let archive = tarball(&[("aiassisted-main/.aiassisted/file1.txt", "one")]);
+
+        let mut mock_http = MockHttpClient::new();
+        let mut mock_checksum = MockChecksum::new();
+        let mut mock_fs = MockFileSystem::new();
+
+        mock_http
+            .expect_get_bytes()
+            .times(1)
+            .return_once(move |_| Ok(archive));
+        mock_checksum
+            .expect_sha256()
+            .returning(|content| format!("checksum-{}", String::from_utf8_lossy(content)));
+        mock_fs.expect_write().times(0);
+
+        let result = download_tarball(
+            &mock_http,
+            &mock_checksum,
+            &mock_fs,
+            &entries,
+            temp_dir.path(),
+        )
+        .await;
+
+        assert!(matches!(result, Err(Error::NotFound(_))));
+    }
+
+    #[tokio::test]
+    async fn test_download_tarball_checksum_mismatch() {
+        let temp_dir = TempDir::new().unwrap();
+        let entries = vec![ManifestEntry {
+            path: PathBuf::from("file1.txt"),
+            checksum: "expected_checksum".to_string(),
+        }];
+        let archive = tarball(&[("aiassisted-main/.aiassisted/file1.txt", "one")]);
+
+        let mut mock_http = MockHttpClient::new();
+        let mut mock_checksum = MockChecksum::new();
+        let mut mock_fs = MockFileSystem::new();
+
+        mock_http
+            .expect_get_bytes()
+            .times(1)
+            .return_once(move |_| Ok(archive));
+        mock_checksum
+            .expect_sha256()
+            .times(1)
+            .returning(|_| "wrong_checksum".to_string());
+        mock_fs.expect_write().times(0);
+
+        let result = download_tarball(
+            &mock_http,
+            &mock_checksum,
+            &mock_fs,
+            &entries,
+            temp_dir.path(),
+        )
+        .await;
+
+        assert!(matches!(result, Err(Error::ChecksumMismatch { .. })));
+    }
+
     #[tokio::test]
     async fn test_download_batch_empty() {
         let temp_dir = TempDir::new().unwrap();
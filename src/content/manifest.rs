@@ -3,6 +3,7 @@
 //! The manifest.json file contains a list of all files in the .aiassisted
 //! directory along with their SHA256 checksums.
 
+use std::collections::HashMap;
 use std::path::Path;
 
 use serde::{Deserialize, Serialize};
@@ -18,16 +19,19 @@ pub struct Manifest {
 }
 
 impl Manifest {
+    /// Parse a manifest from its JSON content.
+    pub fn from_json(content: &str) -> Result<Self> {
+        serde_json::from_str(content).map_err(|e| Error::Serialization(e.to_string()))
+    }
+
     /// Load manifest from a local file.
     pub async fn load_local<F: FileSystem>(fs: &F, path: &Path) -> Result<Self> {
-        let content = fs.read(path).await?;
-        serde_json::from_str(&content).map_err(|e| Error::Serialization(e.to_string()))
+        Self::from_json(&fs.read(path).await?)
     }
 
     /// Load manifest from a remote URL.
     pub async fn load_remote<H: HttpClient>(http: &H, url: &str) -> Result<Self> {
-        let content = http.get(url).await?;
-        serde_json::from_str(&content).map_err(|e| Error::Serialization(e.to_string()))
+        Self::from_json(&http.get(url).await?)
     }
 
     /// Save manifest to a local file.
@@ -39,17 +43,20 @@ impl Manifest {
 
     /// Compare this manifest with another to find differences.
     pub fn diff(&self, other: &Manifest) -> ManifestDiff {
+        // Common case: nothing changed since the last update
+        if self.files == other.files {
+            return ManifestDiff {
+                new_files: Vec::new(),
+                modified_files: Vec::new(),
+            };
+        }
+
         let mut new_files = Vec::new();
         let mut modified_files = Vec::new();
-
-        for other_entry in &other.files {
-            match self
-                .files
-                .iter()
-                .find(|e| e.path == other_entry.path)
-            {
-                Some(local_entry) => {
-                    if local_entry.checksum != other_entry.checksum {
+        let mut classify = |other_entry: &ManifestEntry, local_checksum: Option<&str>| {
+            match local_checksum {
+                Some(checksum) => {
+                    if checksum != other_entry.checksum {
                         modified_files.push(other_entry.clone());
                     }
                 }
@@ -57,6 +64,32 @@ impl Manifest {
                     new_files.push(other_entry.clone());
                 }
             }
+        };
+
+        if is_sorted_by_path(&self.files) && is_sorted_by_path(&other.files) {
+            // Both lists sorted (as generated manifests are): merge-walk them
+            // in a single sequential pass
+            let mut local = self.files.iter().peekable();
+            for other_entry in &other.files {
+                while local.next_if(|e| e.path < other_entry.path).is_some() {}
+                let checksum = local
+                    .next_if(|e| e.path == other_entry.path)
+                    .map(|e| e.checksum.as_str());
+                classify(other_entry, checksum);
+            }
+        } else {
+            // Index local checksums by path; reversed so the first entry for a
+            // duplicated path wins
+            let local: HashMap<&Path, &str> = self
+                .files
+                .iter()
+                .rev()
+                .map(|e| (e.path.as_path(), e.checksum.as_str()))
+                .collect();
+
+            for other_entry in &other.files {
+                classify(other_entry, local.get(other_entry.path.as_path()).copied());
+            }
         }
 
         ManifestDiff {
@@ -66,6 +99,11 @@ impl Manifest {
     }
 }
 
+/// Check whether entries are in strictly ascending path order (no duplicates).
+fn is_sorted_by_path(files: &[ManifestEntry]) -> bool {
+    files.is_sorted_by(|a, b| a.path < b.path)
+}
+
 /// Difference between two manifests.
 #[derive(Debug)]
 pub struct ManifestDiff {
@@ -81,9 +119,9 @@ impl ManifestDiff {
 
     /// Get all files that need to be downloaded.
     pub fn files_to_download(&self) -> Vec<ManifestEntry> {
-        let mut files = Vec::new();
-        files.extend(self.new_files.clone());
-        files.extend(self.modified_files.clone());
+        let mut files = Vec::with_capacity(self.new_files.len() + self.modified_files.len());
+        files.extend_from_slice(&self.new_files);
+        files.extend_from_slice(&self.modified_files);
         files
     }
 }
@@ -108,6 +146,8 @@ mod tests {
             async fn create_dir_all(&self, path: &Path) -> Result<()>;
             async fn list_dir(&self, path: &Path) -> Result<Vec<PathBuf>>;
             async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn remove_dir_all(&self, path: &Path) -> Result<()>;
         }
     }
 
@@ -119,7 +159,7 @@ mod tests {
         impl crate::core::infra::HttpClient for HttpClient {
             async fn get(&self, url: &str) -> Result<String>;
             async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
-            async fn download(&self, url: &str, dest: &Path) -> Result<()>;
+            async fn download(&self, url: &str, dest: &Path) -> Result<String>;
         }
     }
 
@@ -151,6 +191,29 @@ mod tests {
         assert_eq!(diff.modified_files.len(), 0);
     }
 
+    #[test]
+    fn test_manifest_diff_reordered_files() {
+        let first = ManifestEntry {
+            path: PathBuf::from("a.txt"),
+            checksum: "aaa".to_string(),
+        };
+        let second = ManifestEntry {
+            path: PathBuf::from("b.txt"),
+            checksum: "bbb".to_string(),
+        };
+        let manifest1 = Manifest {
+            version: "1.0.0".to_string(),
+            files: vec![first.clone(), second.clone()],
+        };
+        let manifest2 = Manifest {
+            version: "1.0.1".to_string(),
+            files: vec![second, first],
+        };
+
+        // Same files in a different order are not a change
+        assert!(!manifest1.diff(&manifest2).has_changes());
+    }
+
     #[test]
     fn test_manifest_diff_new_file() {
         let manifest1 = Manifest {
@@ -239,6 +302,59 @@ mod tests {
         assert_eq!(diff.modified_files.len(), 1);
     }
 
+    #[test]
+    fn test_manifest_diff_many_files() {
+        let entry = |i: usize, checksum: &str| ManifestEntry {
+            path: PathBuf::from(format!("file{}.txt", i)),
+            checksum: checksum.to_string(),
+        };
+        let manifest1 = Manifest {
+            version: "1.0.0".to_string(),
+            files: (0..1000).map(|i| entry(i, "old")).collect(),
+        };
+        let manifest2 = Manifest {
+            version: "1.0.1".to_string(),
+            files: (0..1000)
+                .rev()
+                .map(|i| entry(i, if i % 10 == 0 { "new" } else { "old" }))
+                .chain((1000..1005).map(|i| entry(i, "new")))
+                .collect(),
+        };
+
+        let diff = manifest1.diff(&manifest2);
+
+        assert_eq!(diff.new_files.len(), 5);
+        assert_eq!(diff.modified_files.len(), 100);
+    }
+
+    #[test]
+    fn test_manifest_diff_sorted_merge_walk() {
+        let entry = |path: &str, checksum: &str| ManifestEntry {
+            path: PathBuf::from(path),
+            checksum: checksum.to_string(),
+        };
+        let manifest1 = Manifest {
+            version: "1.0.0".to_string(),
+            files: vec![entry("a.txt", "1"), entry("c.txt", "3"), entry("d.txt", "4")],
+        };
+        let manifest2 = Manifest {
+            version: "1.0.1".to_string(),
+            files: vec![
+                entry("b.txt", "2"),
+                entry("c.txt", "3"),
+                entry("d.txt", "changed"),
+                entry("e.txt", "5"),
+            ],
+        };
+
+        let diff = manifest1.diff(&manifest2);
+
+        let new: Vec<_> = diff.new_files.iter().map(|e| e.path.clone()).collect();
+        let modified: Vec<_> = diff.modified_files.iter().map(|e| e.path.clone()).collect();
+        assert_eq!(new, vec![PathBuf::from("b.txt"), PathBuf::from("e.txt")]);
+        assert_eq!(modified, vec![PathBuf::from("d.txt")]);
+    }
+
     #[test]
     fn test_files_to_download() {
         let manifest1 = Manifest {
@@ -288,6 +404,17 @@ mod tests {
         assert_eq!(diff.modified_files.len(), 0);
     }
 
+    #[test]
+    fn test_from_json() {
+        let manifest =
+            Manifest::from_json(r#"{"version":"1.0.0","files":[{"path":"a.txt","checksum":"abc"}]}"#)
+                .unwrap();
+
+        assert_eq!(manifest.version, "1.0.0");
+        assert_eq!(manifest.files[0].path, PathBuf::from("a.txt"));
+        assert!(Manifest::from_json("not json").is_err());
+    }
+
     #[tokio::test]
     async fn test_load_local_success() {
         let mut mock_fs = MockFileSystem::new();
@@ -3,9 +3,11 @@
 //! This module handles installing, updating, and checking the .aiassisted
 //! directory structure that contains guidelines, templates, and instructions.
 
+pub mod cache;
 pub mod commands;
 pub mod github;
 pub mod manifest;
 pub mod sync;
 
+pub use cache::ManifestCache;
 pub use commands::{CheckCommand, InstallCommand, UpdateCommand};
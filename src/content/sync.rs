@@ -1,20 +1,29 @@
 //! Sync logic for installing and updating .aiassisted content.
 
-use std::path::Path;
+use std::path::{Path, PathBuf};
 
 use crate::core::infra::{Checksum, FileSystem, HttpClient, Logger};
-use crate::core::types::Result;
+use crate::core::types::{Error, ManifestEntry, Result};
 
+use super::cache::ManifestCache;
 use super::github;
 use super::manifest::Manifest;
 
+/// Directory, inside the target directory, that downloads are assembled in
+/// before being renamed into `.aiassisted`.
+const STAGING_DIR: &str = ".aiassisted-staging";
+
 /// Install .aiassisted to a target directory.
+///
+/// With a `cache`, the remote manifest is revalidated against the cached
+/// copy (a `304` skips the body) and the cache refreshed for a later `check`.
 pub async fn install<F, H, C, L>(
     fs: &F,
     http: &H,
     checksum: &C,
     logger: &L,
     target_dir: &Path,
+    cache: Option<&ManifestCache>,
 ) -> Result<()>
 where
     F: FileSystem,
@@ -31,7 +40,8 @@ where
     }
 
     logger.info("Downloading manifest...");
-    let manifest = Manifest::load_remote(http, &github::manifest_url()).await?;
+    let manifest_url = github::manifest_url();
+    let manifest = fetch_remote(fs, http, cache, &manifest_url).await?;
 
     logger.info(&format!(
         "Manifest loaded: version {}, {} files",
@@ -39,27 +49,43 @@ where
         manifest.files.len()
     ));
 
-    // Create .aiassisted directory
-    fs.create_dir_all(&aiassisted_dir).await?;
+    // Build the installation in a staging directory next to the final one and
+    // rename it into place, so an interrupted install never leaves a partial
+    // .aiassisted behind and the files are written exactly once.
+    let staging_dir = prepare_staging_dir(fs, target_dir).await?;
+    let staged_aiassisted_dir = staging_dir.join(".aiassisted");
 
-    // Download all files
     logger.info("Downloading files...");
-    let downloaded = github::download_batch(http, checksum, fs, &manifest.files, target_dir).await?;
+    let staged = async {
+        let downloaded =
+            download_all(http, checksum, fs, logger, &manifest.files, &staging_dir).await?;
+
+        // Save manifest locally
+        let manifest_path = staged_aiassisted_dir.join("manifest.json");
+        manifest.save(fs, &manifest_path).await?;
+
+        fs.rename(&staged_aiassisted_dir, &aiassisted_dir).await?;
+        Ok::<_, Error>(downloaded.len())
+    }
+    .await;
+
+    remove_staging_dir(fs, logger, &staging_dir).await;
+    let installed = staged?;
 
     logger.success(&format!(
         "Successfully installed {} files to {}",
-        downloaded.len(),
+        installed,
         aiassisted_dir.display()
     ));
 
-    // Save manifest locally
-    let manifest_path = aiassisted_dir.join("manifest.json");
-    manifest.save(fs, &manifest_path).await?;
-
     Ok(())
 }
 
 /// Update existing .aiassisted installation.
+///
+/// The remote manifest is always checked with the server. With a `cache`,
+/// that is a conditional request against the cached copy, and the cache is
+/// refreshed so a later `check` sees what was installed.
 pub async fn update<F, H, C, L>(
     fs: &F,
     http: &H,
@@ -67,6 +93,7 @@ pub async fn update<F, H, C, L>(
     logger: &L,
     target_dir: &Path,
     force: bool,
+    cache: Option<&ManifestCache>,
 ) -> Result<()>
 where
     F: FileSystem,
@@ -87,19 +114,17 @@ where
     // Load local and remote manifests
     let local_manifest_path = aiassisted_dir.join("manifest.json");
     let local_manifest = Manifest::load_local(fs, &local_manifest_path).await?;
-    let remote_manifest = Manifest::load_remote(http, &github::manifest_url()).await?;
+    let manifest_url = github::manifest_url();
+    let remote_manifest = fetch_remote(fs, http, cache, &manifest_url).await?;
 
     logger.info(&format!(
         "Local: v{}, Remote: v{}",
         local_manifest.version, remote_manifest.version
     ));
 
-    if force {
+    let files_to_download = if force {
         logger.info("Force update: downloading all files...");
-        let downloaded =
-            github::download_batch(http, checksum, fs, &remote_manifest.files, target_dir).await?;
-
-        logger.success(&format!("Updated {} files (forced)", downloaded.len()));
+        remote_manifest.files.clone()
     } else {
         // Compare manifests
         let diff = local_manifest.diff(&remote_manifest);
@@ -116,11 +141,39 @@ where
         ));
 
         // Download only changed files
-        let files_to_download = diff.files_to_download();
-        let downloaded =
-            github::download_batch(http, checksum, fs, &files_to_download, target_dir).await?;
+        diff.files_to_download()
+    };
+
+    // Download into the staging directory first and only then move the files
+    // over the installed ones, so a failed download leaves .aiassisted as it
+    // was. Each move is a rename, unless .aiassisted lives on another file
+    // system (a symlink or mount), where it falls back to a copy.
+    let staging_dir = prepare_staging_dir(fs, target_dir).await?;
+    let staged = async {
+        let downloaded = if force {
+            download_all(http, checksum, fs, logger, &files_to_download, &staging_dir).await?
+        } else {
+            github::download_batch(http, checksum, fs, &files_to_download, &staging_dir).await?
+        };
+
+        let staged_aiassisted_dir = staging_dir.join(".aiassisted");
+        for entry in &files_to_download {
+            let installed_path = aiassisted_dir.join(&entry.path);
+            if let Some(parent) = installed_path.parent() {
+                fs.create_dir_all(parent).await?;
+            }
+            move_file(fs, &staged_aiassisted_dir.join(&entry.path), &installed_path).await?;
+        }
+        Ok::<_, Error>(downloaded.len())
+    }
+    .await;
+    remove_staging_dir(fs, logger, &staging_dir).await;
+    let updated = staged?;
 
-        logger.success(&format!("Updated {} files", downloaded.len()));
+    if force {
+        logger.success(&format!("Updated {} files (forced)", updated));
+    } else {
+        logger.success(&format!("Updated {} files", updated));
     }
 
     // Save updated manifest
@@ -130,11 +183,15 @@ where
 }
 
 /// Check for updates without downloading.
+///
+/// With a `cache`, a recently fetched remote manifest is reused instead of
+/// downloading it again.
 pub async fn check<F, H, L>(
     fs: &F,
     http: &H,
     logger: &L,
     target_dir: &Path,
+    cache: Option<&ManifestCache>,
 ) -> Result<()>
 where
     F: FileSystem,
@@ -154,7 +211,11 @@ where
     // Load local and remote manifests
     let local_manifest_path = aiassisted_dir.join("manifest.json");
     let local_manifest = Manifest::load_local(fs, &local_manifest_path).await?;
-    let remote_manifest = Manifest::load_remote(http, &github::manifest_url()).await?;
+    let manifest_url = github::manifest_url();
+    let remote_manifest = match cache {
+        Some(cache) => cache.fetch(fs, http, &manifest_url).await?,
+        None => Manifest::load_remote(http, &manifest_url).await?,
+    };
 
     logger.info(&format!(
         "Local: v{}, Remote: v{}",
@@ -196,11 +257,93 @@ where
     Ok(())
 }
 
+/// Create an empty staging directory in `target_dir`, clearing any left
+/// behind by an interrupted run.
+async fn prepare_staging_dir<F: FileSystem>(fs: &F, target_dir: &Path) -> Result<PathBuf> {
+    let staging_dir = target_dir.join(STAGING_DIR);
+    if fs.exists(&staging_dir) {
+        fs.remove_dir_all(&staging_dir).await?;
+    }
+    fs.create_dir_all(&staging_dir.join(".aiassisted")).await?;
+    Ok(staging_dir)
+}
+
+/// Remove the staging directory; failing to do so is not an error.
+async fn remove_staging_dir<F: FileSystem, L: Logger>(fs: &F, logger: &L, staging_dir: &Path) {
+    if let Err(e) = fs.remove_dir_all(staging_dir).await {
+        if logger.is_debug_enabled() {
+            logger.debug(&format!("Could not remove {}: {}", staging_dir.display(), e));
+        }
+    }
+}
+
+/// Move a file by renaming it, copying instead when `to` is on another
+/// file system.
+///
+/// The copied source is left for the staging cleanup to remove.
+async fn move_file<F: FileSystem>(fs: &F, from: &Path, to: &Path) -> Result<()> {
+    match fs.rename(from, to).await {
+        Err(Error::Io(e)) if e.kind() == std::io::ErrorKind::CrossesDevices => {
+            fs.copy(from, to).await
+        }
+        result => result,
+    }
+}
+
+/// Download every file in `entries`.
+///
+/// Tries the repository tarball first (one request for the whole tree) and
+/// falls back to fetching the files one by one if that fails.
+async fn download_all<H, C, F, L>(
+    http: &H,
+    checksum: &C,
+    fs: &F,
+    logger: &L,
+    entries: &[ManifestEntry],
+    target_dir: &Path,
+) -> Result<Vec<PathBuf>>
+where
+    H: HttpClient,
+    C: Checksum,
+    F: FileSystem,
+    L: Logger,
+{
+    match github::download_tarball(http, checksum, fs, entries, target_dir).await {
+        Ok(downloaded) => Ok(downloaded),
+        Err(e) => {
+            if logger.is_debug_enabled() {
+                logger.debug(&format!(
+                    "Tarball download failed ({}), downloading files individually",
+                    e
+                ));
+            }
+            github::download_batch(http, checksum, fs, entries, target_dir).await
+        }
+    }
+}
+
+/// Fetch the remote manifest from the server, revalidating the cached copy
+/// if there is a cache.
+async fn fetch_remote<F, H>(
+    fs: &F,
+    http: &H,
+    cache: Option<&ManifestCache>,
+    url: &str,
+) -> Result<Manifest>
+where
+    F: FileSystem,
+    H: HttpClient,
+{
+    match cache {
+        Some(cache) => cache.revalidate(fs, http, url).await,
+        None => Manifest::load_remote(http, url).await,
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
     use mockall::{mock, predicate::*};
-    use std::path::PathBuf;
     use tempfile::TempDir;
 
     // Mock implementations
@@ -217,6 +360,8 @@ mod tests {
             async fn create_dir_all(&self, path: &Path) -> Result<()>;
             async fn list_dir(&self, path: &Path) -> Result<Vec<PathBuf>>;
             async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+            async fn remove_dir_all(&self, path: &Path) -> Result<()>;
         }
     }
 
@@ -227,7 +372,7 @@ mod tests {
         impl crate::core::infra::HttpClient for HttpClient {
             async fn get(&self, url: &str) -> Result<String>;
             async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
-            async fn download(&self, url: &str, dest: &Path) -> Result<()>;
+            async fn download(&self, url: &str, dest: &Path) -> Result<String>;
         }
     }
 
@@ -275,12 +420,197 @@ mod tests {
             &mock_checksum,
             &mock_logger,
             temp_dir.path(),
+            None,
         )
         .await;
 
         assert!(result.is_ok());
     }
 
+    /// Filesystem for a fresh install into `target`: nothing exists yet.
+    fn fresh_install_mocks(target: &Path) -> (MockFileSystem, MockHttpClient, MockLogger) {
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let mut mock_logger = MockLogger::new();
+
+        mock_fs.expect_exists().returning(|_| false);
+        mock_fs.expect_create_dir_all().returning(|_| Ok(()));
+        let staging_dir = target.join(STAGING_DIR);
+        mock_fs
+            .expect_remove_dir_all()
+            .withf(move |path: &Path| path == staging_dir)
+            .times(1)
+            .returning(|_| Ok(()));
+
+        mock_http
+            .expect_get()
+            .returning(|_| Ok(r#"{"version":"1.0.0","files":[]}"#.to_string()));
+        mock_http
+            .expect_get_bytes()
+            .returning(|_| Err(Error::Network("offline".to_string())));
+
+        mock_logger.expect_info().return_const(());
+        mock_logger.expect_debug().return_const(());
+        mock_logger.expect_success().return_const(());
+
+        (mock_fs, mock_http, mock_logger)
+    }
+
+    #[tokio::test]
+    async fn test_install_renames_staging_dir_into_place() {
+        let temp_dir = TempDir::new().unwrap();
+        let target = temp_dir.path().to_path_buf();
+        let (mut mock_fs, mock_http, mock_logger) = fresh_install_mocks(&target);
+        let mock_checksum = MockChecksum::new();
+
+        mock_fs
+            .expect_write()
+            .withf(|path: &Path, _: &str| {
+                path.ends_with(".aiassisted-staging/.aiassisted/manifest.json")
+            })
+            .times(1)
+            .returning(|_, _| Ok(()));
+        let (staged, installed) = (
+            target.join(STAGING_DIR).join(".aiassisted"),
+            target.join(".aiassisted"),
+        );
+        mock_fs
+            .expect_rename()
+            .withf(move |from: &Path, to: &Path| from == staged && to == installed)
+            .times(1)
+            .returning(|_, _| Ok(()));
+
+        let result = install(
+            &mock_fs,
+            &mock_http,
+            &mock_checksum,
+            &mock_logger,
+            &target,
+            None,
+        )
+        .await;
+
+        assert!(result.is_ok());
+    }
+
+    #[tokio::test]
+    async fn test_install_failure_removes_staging_dir() {
+        let temp_dir = TempDir::new().unwrap();
+        let target = temp_dir.path().to_path_buf();
+        let (mut mock_fs, mock_http, mock_logger) = fresh_install_mocks(&target);
+        let mock_checksum = MockChecksum::new();
+
+        mock_fs
+            .expect_write()
+            .returning(|_, _| Err(Error::Io(std::io::Error::other("disk full"))));
+        mock_fs.expect_rename().times(0);
+
+        let result = install(
+            &mock_fs,
+            &mock_http,
+            &mock_checksum,
+            &mock_logger,
+            &target,
+            None,
+        )
+        .await;
+
+        assert!(result.is_err());
+    }
+
+    #[tokio::test]
+    async fn test_update_moves_staged_files_into_place() {
+        let temp_dir = TempDir::new().unwrap();
+        let target = temp_dir.path().to_path_buf();
+        let mut mock_fs = MockFileSystem::new();
+        let mut mock_http = MockHttpClient::new();
+        let mut mock_checksum = MockChecksum::new();
+        let mut mock_logger = MockLogger::new();
+
+        mock_fs
+            .expect_exists()
+            .returning(|path| !path.ends_with(STAGING_DIR));
+        mock_fs.expect_read().returning(|_| {
+            Ok(r#"{"version":"1.0.0","files":[{"path":"a.txt","checksum":"old"}]}"#.to_string())
+        });
+        mock_fs.expect_create_dir_all().returning(|_| Ok(()));
+        mock_fs.expect_write().returning(|_, _| Ok(()));
+        let (staged, installed) = (
+            target.join(STAGING_DIR).join(".aiassisted/a.txt"),
+            target.join(".aiassisted/a.txt"),
+        );
+        mock_fs
+            .expect_rename()
+            .withf(move |from: &Path, to: &Path| from == staged && to == installed)
+            .times(1)
+            .returning(|_, _| Ok(()));
+        mock_fs
+            .expect_remove_dir_all()
+            .times(1)
+            .returning(|_| Ok(()));
+
+        mock_http.expect_get().returning(|url| {
+            if url.ends_with("manifest.json") {
+                Ok(r#"{"version":"1.0.1","files":[{"path":"a.txt","checksum":"new"}]}"#.to_string())
+            } else {
+                Ok("new content".to_string())
+            }
+        });
+        mock_checksum
+            .expect_sha256()
+            .returning(|_| "new".to_string());
+
+        mock_logger.expect_info().return_const(());
+        mock_logger
+            .expect_success()
+            .withf(|msg: &str| msg == "Updated 1 files")
+            .times(1)
+            .return_const(());
+
+        let result = update(
+            &mock_fs,
+            &mock_http,
+            &mock_checksum,
+            &mock_logger,
+            &target,
+            false,
+            None,
+        )
+        .await;
+
+        assert!(result.is_ok());
+    }
+
+    #[tokio::test]
+    async fn test_move_file_copies_across_devices() {
+        let mut mock_fs = MockFileSystem::new();
+        mock_fs.expect_rename().times(1).returning(|_, _| {
+            Err(Error::Io(std::io::Error::from(std::io::ErrorKind::CrossesDevices)))
+        });
+        mock_fs
+            .expect_copy()
+            .withf(|from: &Path, to: &Path| {
+                from == Path::new("staged") && to == Path::new("installed")
+            })
+            .times(1)
+            .returning(|_, _| Ok(()));
+
+        let result = move_file(&mock_fs, Path::new("staged"), Path::new("installed")).await;
+        assert!(result.is_ok());
+    }
+
+    #[tokio::test]
+    async fn test_move_file_propagates_other_errors() {
+        let mut mock_fs = MockFileSystem::new();
+        mock_fs.expect_rename().times(1).returning(|_, _| {
+            Err(Error::Io(std::io::Error::from(std::io::ErrorKind::PermissionDenied)))
+        });
+        mock_fs.expect_copy().times(0);
+
+        let result = move_file(&mock_fs, Path::new("staged"), Path::new("installed")).await;
+        assert!(result.is_err());
+    }
+
     #[tokio::test]
     async fn test_check_not_installed() {
         let temp_dir = TempDir::new().unwrap();
@@ -297,7 +627,7 @@ mod tests {
             .withf(|msg: &str| msg.contains("not found"))
             .return_const(());
 
-        let result = check(&mock_fs, &mock_http, &mock_logger, temp_dir.path()).await;
+        let result = check(&mock_fs, &mock_http, &mock_logger, temp_dir.path(), None).await;
 
         assert!(result.is_ok());
     }
@@ -7,7 +7,7 @@ use std::path::{Path, PathBuf};
 
 use async_trait::async_trait;
 
-use super::types::Result;
+use super::types::{FetchResult, Result};
 
 /// Abstraction for file system operations.
 #[async_trait]
@@ -27,6 +27,14 @@ pub trait FileSystem: Send + Sync {
     /// Check if a path is a file.
     fn is_file(&self, path: &Path) -> bool;
 
+    /// Get the size of a file in bytes, if it can be determined.
+    ///
+    /// The default implementation doesn't know sizes and returns `None`.
+    fn file_size(&self, path: &Path) -> Option<u64> {
+        let _ = path;
+        None
+    }
+
     /// Create a directory and all parent directories.
     async fn create_dir_all(&self, path: &Path) -> Result<()>;
 
@@ -35,6 +43,21 @@ pub trait FileSystem: Send + Sync {
 
     /// Copy a file from source to destination.
     async fn copy(&self, from: &Path, to: &Path) -> Result<()>;
+
+    /// Rename a file or directory. Both paths must be on the same file system.
+    async fn rename(&self, from: &Path, to: &Path) -> Result<()>;
+
+    /// Remove a directory and all of its contents.
+    async fn remove_dir_all(&self, path: &Path) -> Result<()>;
+}
+
+/// Check whether `entry` is a directory holding a `name` marker file
+/// (such as `SKILL.md` or `AGENT.md`).
+///
+/// The marker can only be a file if `entry` is a directory, so a single
+/// stat of the marker answers both questions.
+pub fn has_marker_file<F: FileSystem + ?Sized>(fs: &F, entry: &Path, name: &str) -> bool {
+    fs.is_file(&entry.join(name))
 }
 
 /// Abstraction for HTTP client operations.
@@ -46,8 +69,60 @@ pub trait HttpClient: Send + Sync {
     /// Perform a GET request and return the response body as bytes.
     async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
 
+    /// Perform a GET request that is skipped if `etag` still matches.
+    ///
+    /// The default implementation ignores `etag` and always fetches the body.
+    async fn get_conditional(&self, url: &str, etag: Option<&str>) -> Result<FetchResult> {
+        let _ = etag;
+        Ok(FetchResult::Modified {
+            body: self.get(url).await?,
+            etag: None,
+        })
+    }
+
     /// Download a file from a URL to a destination path.
-    async fn download(&self, url: &str, dest: &Path) -> Result<()>;
+    ///
+    /// Returns the SHA256 checksum of the downloaded bytes, computed while
+    /// they are written so the file never has to be read back to verify it.
+    async fn download(&self, url: &str, dest: &Path) -> Result<String>;
+}
+
+/// Fewest items worth handing to a worker thread of their own.
+///
+/// Spawning a thread costs about as much as hashing a few small files, so
+/// batches are only split once every worker gets at least this many.
+const MIN_ITEMS_PER_WORKER: usize = 8;
+
+/// Apply `f` to every item, splitting `items` into one chunk per core and
+/// processing the chunks on scoped threads.
+///
+/// Results are in the same order as `items`. Batches too small to give
+/// each worker [`MIN_ITEMS_PER_WORKER`] items run on the calling thread.
+pub(crate) fn par_chunks<T, R, F>(items: &[T], f: F) -> Vec<R>
+where
+    T: Sync,
+    R: Send,
+    F: Fn(&T) -> R + Sync,
+{
+    let workers = std::thread::available_parallelism()
+        .map_or(1, |n| n.get())
+        .min(items.len() / MIN_ITEMS_PER_WORKER);
+    if workers <= 1 {
+        return items.iter().map(f).collect();
+    }
+
+    let f = &f;
+    let chunk_size = items.len().div_ceil(workers);
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = items
+            .chunks(chunk_size)
+            .map(|chunk| scope.spawn(move || chunk.iter().map(f).collect::<Vec<_>>()))
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|handle| handle.join().expect("worker thread panicked"))
+            .collect()
+    })
 }
 
 /// Abstraction for checksum operations.
@@ -57,6 +132,15 @@ pub trait Checksum: Send + Sync {
 
     /// Calculate SHA256 checksum of a file.
     fn sha256_file(&self, path: &Path) -> Result<String>;
+
+    /// Calculate SHA256 checksums of several files.
+    ///
+    /// Results are in the same order as `paths`. The default implementation
+    /// splits the paths into one chunk per core and hashes the chunks on
+    /// scoped threads; small batches are hashed on the calling thread.
+    fn sha256_files(&self, paths: &[&Path]) -> Vec<Result<String>> {
+        par_chunks(paths, |path| self.sha256_file(path))
+    }
 }
 
 /// Abstraction for logging operations.
@@ -73,6 +157,14 @@ pub trait Logger: Send + Sync {
     /// Log a debug message.
     fn debug(&self, msg: &str);
 
+    /// Check whether debug messages are shown.
+    ///
+    /// Callers can test this before formatting a debug message that would
+    /// otherwise be built only to be discarded.
+    fn is_debug_enabled(&self) -> bool {
+        true
+    }
+
     /// Log a success message.
     fn success(&self, msg: &str);
 }
@@ -73,7 +73,7 @@ impl std::str::FromStr for ToolType {
 }
 
 /// A manifest entry representing a file with its checksum.
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
 pub struct ManifestEntry {
     /// Relative path to the file.
     pub path: PathBuf,
@@ -128,3 +128,11 @@ pub struct ReleaseInfo {
     pub checksum: Option<String>,
 }
 
+/// Response to a conditional GET (see `HttpClient::get_conditional`).
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub enum FetchResult {
+    /// The server sent a body, along with its `ETag` if it reported one.
+    Modified { body: String, etag: Option<String> },
+    /// The server answered `304 Not Modified`: the caller's copy is current.
+    NotModified,
+}
@@ -0,0 +1,308 @@
+//! Checksum decorator that remembers file hashes between runs.
+
+use std::collections::HashMap;
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Mutex, OnceLock};
+use std::time::{Duration, SystemTime, UNIX_EPOCH};
+
+use serde::{Deserialize, Serialize};
+
+use crate::core::infra::Checksum;
+use crate::core::types::{Error, Result};
+
+/// Cache file name inside the user cache directory.
+const CACHE_FILE: &str = "file-hashes.json";
+
+/// Files modified more recently than this are hashed but not remembered,
+/// since another write within the same timestamp tick would go unnoticed.
+const RECENT_WRITE_WINDOW: Duration = Duration::from_secs(2);
+
+/// Most entries kept in the store; beyond this only files hashed during
+/// the current run are kept.
+const MAX_ENTRIES: usize = 4096;
+
+/// Remembered hash of a file, valid while its size and mtime are unchanged.
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+struct HashEntry {
+    size: u64,
+    mtime_ns: u64,
+    sha256: String,
+    /// Whether the entry was looked up or added during this run.
+    #[serde(skip)]
+    used: bool,
+}
+
+/// Checksum that skips rehashing files whose size and mtime are unchanged.
+///
+/// File hashes are keyed by absolute path and stored as JSON. The store is
+/// read on the first `sha256_file` call, so commands that never hash a file
+/// don't pay for it, and written back by [`CachingChecksum::save`].
+/// Hashing of in-memory content is passed straight to the inner checksum.
+#[derive(Debug)]
+pub struct CachingChecksum<C: Checksum> {
+    inner: C,
+    path: Option<PathBuf>,
+    entries: OnceLock<Mutex<HashMap<PathBuf, HashEntry>>>,
+    dirty: AtomicBool,
+}
+
+impl<C: Checksum> CachingChecksum<C> {
+    /// Wrap `inner`, persisting hashes to the file at `path`.
+    pub fn new(inner: C, path: PathBuf) -> Self {
+        Self {
+            inner,
+            path: Some(path),
+            entries: OnceLock::new(),
+            dirty: AtomicBool::new(false),
+        }
+    }
+
+    /// Wrap `inner`, persisting hashes in the user cache directory
+    /// (`<cache dir>/aiassisted/file-hashes.json`).
+    ///
+    /// Without a cache directory, hashes are only remembered for this run.
+    pub fn default_location(inner: C) -> Self {
+        Self {
+            inner,
+            path: dirs::cache_dir().map(|dir| dir.join("aiassisted").join(CACHE_FILE)),
+            entries: OnceLock::new(),
+            dirty: AtomicBool::new(false),
+        }
+    }
+
+    /// Write the remembered hashes back, if any were added this run.
+    ///
+    /// Entries for files that no longer exist are dropped first, and if the
+    /// store is still over [`MAX_ENTRIES`] only this run's entries are kept.
+    /// The file is replaced atomically, so a concurrent reader never sees a
+    /// partial write.
+    pub fn save(&self) -> Result<()> {
+        let (Some(path), Some(entries)) = (&self.path, self.entries.get()) else {
+            return Ok(());
+        };
+        if !self.dirty.swap(false, Ordering::Relaxed) {
+            return Ok(());
+        }
+
+        let content = {
+            let mut entries = entries.lock().unwrap();
+            entries.retain(|file, _| file.exists());
+            if entries.len() > MAX_ENTRIES {
+                entries.retain(|_, entry| entry.used);
+            }
+            serde_json::to_string(&*entries).map_err(|e| Error::Serialization(e.to_string()))?
+        };
+
+        if let Some(parent) = path.parent() {
+            std::fs::create_dir_all(parent)?;
+        }
+        let temp_path = path.with_extension(format!("{}.tmp", std::process::id()));
+        std::fs::write(&temp_path, content)?;
+        if let Err(e) = std::fs::rename(&temp_path, path) {
+            let _ = std::fs::remove_file(&temp_path);
+            return Err(e.into());
+        }
+        Ok(())
+    }
+
+    /// Get the remembered hashes, reading the store on first use.
+    ///
+    /// A missing or unreadable store is treated as empty.
+    fn entries(&self) -> &Mutex<HashMap<PathBuf, HashEntry>> {
+        self.entries.get_or_init(|| {
+            let entries = self
+                .path
+                .as_ref()
+                .and_then(|path| std::fs::read_to_string(path).ok())
+                .and_then(|content| serde_json::from_str(&content).ok())
+                .unwrap_or_default();
+            Mutex::new(entries)
+        })
+    }
+}
+
+impl<C: Checksum> Checksum for CachingChecksum<C> {
+    fn sha256(&self, content: &[u8]) -> String {
+        self.inner.sha256(content)
+    }
+
+    fn sha256_file(&self, path: &Path) -> Result<String> {
+        let metadata = std::fs::metadata(path)?;
+        let modified = metadata.modified()?;
+        // Paths are made absolute (without resolving symlinks) so the same file
+        // reached from different working directories shares an entry
+        let key = std::path::absolute(path)?;
+        let size = metadata.len();
+        let mtime_ns = modified
+            .duration_since(UNIX_EPOCH)
+            .map_or(0, |d| d.as_nanos() as u64);
+
+        if let Some(entry) = self.entries().lock().unwrap().get_mut(&key) {
+            if entry.size == size && entry.mtime_ns == mtime_ns {
+                entry.used = true;
+                return Ok(entry.sha256.clone());
+            }
+        }
+
+        let sha256 = self.inner.sha256_file(path)?;
+
+        let settled = SystemTime::now()
+            .duration_since(modified)
+            .is_ok_and(|age| age >= RECENT_WRITE_WINDOW);
+        if settled {
+            let entry = HashEntry {
+                size,
+                mtime_ns,
+                sha256: sha256.clone(),
+                used: true,
+            };
+            self.entries().lock().unwrap().insert(key, entry);
+            self.dirty.store(true, Ordering::Relaxed);
+        }
+
+        Ok(sha256)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::infra::Sha2Checksum;
+    use std::fs::{File, FileTimes};
+    use std::sync::atomic::AtomicUsize;
+    use tempfile::TempDir;
+
+    /// Checksum that counts how many files it actually hashed.
+    #[derive(Default)]
+    struct CountingChecksum {
+        inner: Sha2Checksum,
+        files_hashed: AtomicUsize,
+    }
+
+    impl Checksum for &CountingChecksum {
+        fn sha256(&self, content: &[u8]) -> String {
+            self.inner.sha256(content)
+        }
+
+        fn sha256_file(&self, path: &Path) -> Result<String> {
+            self.files_hashed.fetch_add(1, Ordering::Relaxed);
+            self.inner.sha256_file(path)
+        }
+    }
+
+    /// Write `content` to `path` with an mtime safely in the past.
+    fn write_settled(path: &Path, content: &str) {
+        std::fs::write(path, content).unwrap();
+        let past = SystemTime::now() - Duration::from_secs(60);
+        File::options()
+            .write(true)
+            .open(path)
+            .unwrap()
+            .set_times(FileTimes::new().set_modified(past))
+            .unwrap();
+    }
+
+    #[test]
+    fn test_unchanged_file_is_not_rehashed() {
+        let temp_dir = TempDir::new().unwrap();
+        let file = temp_dir.path().join("file.txt");
+        write_settled(&file, "test content");
+
+        let counting = CountingChecksum::default();
+        let checksum = CachingChecksum::new(&counting, temp_dir.path().join("hashes.json"));
+
+        let first = checksum.sha256_file(&file).unwrap();
+        let second = checksum.sha256_file(&file).unwrap();
+
+        assert_eq!(first, second);
+        assert_eq!(
+            first,
+            "6ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
+        );
+        assert_eq!(counting.files_hashed.load(Ordering::Relaxed), 1);
+    }
+
+    #[test]
+    fn test_changed_file_is_rehashed() {
+        let temp_dir = TempDir::new().unwrap();
+        let file = temp_dir.path().join("file.txt");
+        write_settled(&file, "old");
+
+        let counting = CountingChecksum::default();
+        let checksum = CachingChecksum::new(&counting, temp_dir.path().join("hashes.json"));
+        let old = checksum.sha256_file(&file).unwrap();
+
+        write_settled(&file, "new content");
+        let new = checksum.sha256_file(&file).unwrap();
+
+        assert_ne!(old, new);
+        assert_eq!(new, counting.inner.sha256(b"new content"));
+        assert_eq!(counting.files_hashed.load(Ordering::Relaxed), 2);
+    }
+
+    #[test]
+    fn test_recently_written_file_is_not_remembered() {
+        let temp_dir = TempDir::new().unwrap();
+        let file = temp_dir.path().join("file.txt");
+        std::fs::write(&file, "just written").unwrap();
+
+        let counting = CountingChecksum::default();
+        let checksum = CachingChecksum::new(&counting, temp_dir.path().join("hashes.json"));
+        checksum.sha256_file(&file).unwrap();
+        checksum.sha256_file(&file).unwrap();
+
+        assert_eq!(counting.files_hashed.load(Ordering::Relaxed), 2);
+    }
+
+    #[test]
+    fn test_hashes_persist_across_runs() {
+        let temp_dir = TempDir::new().unwrap();
+        let file = temp_dir.path().join("file.txt");
+        let store = temp_dir.path().join("cache/hashes.json");
+        write_settled(&file, "test content");
+
+        let counting = CountingChecksum::default();
+        let first_run = CachingChecksum::new(&counting, store.clone());
+        let expected = first_run.sha256_file(&file).unwrap();
+        first_run.save().unwrap();
+
+        let second_run = CachingChecksum::new(&counting, store);
+        assert_eq!(second_run.sha256_file(&file).unwrap(), expected);
+        assert_eq!(counting.files_hashed.load(Ordering::Relaxed), 1);
+    }
+
+    #[test]
+    fn test_save_drops_deleted_files() {
+        let temp_dir = TempDir::new().unwrap();
+        let kept = temp_dir.path().join("kept.txt");
+        let deleted = temp_dir.path().join("deleted.txt");
+        let store = temp_dir.path().join("hashes.json");
+        write_settled(&kept, "kept");
+        write_settled(&deleted, "deleted");
+
+        let checksum = CachingChecksum::new(Sha2Checksum::new(), store.clone());
+        checksum.sha256_file(&kept).unwrap();
+        checksum.sha256_file(&deleted).unwrap();
+        std::fs::remove_file(&deleted).unwrap();
+        checksum.save().unwrap();
+
+        let saved: HashMap<PathBuf, HashEntry> =
+            serde_json::from_str(&std::fs::read_to_string(&store).unwrap()).unwrap();
+        assert_eq!(saved.len(), 1);
+        assert!(saved.contains_key(&std::path::absolute(&kept).unwrap()));
+
+        // Only the store itself is left behind, no temporary file
+        let files: Vec<_> = std::fs::read_dir(temp_dir.path()).unwrap().collect();
+        assert_eq!(files.len(), 2);
+    }
+
+    #[test]
+    fn test_missing_file_is_an_error() {
+        let temp_dir = TempDir::new().unwrap();
+        let checksum = CachingChecksum::new(Sha2Checksum::new(), temp_dir.path().join("hashes.json"));
+
+        let result = checksum.sha256_file(&temp_dir.path().join("missing.txt"));
+        assert!(result.is_err());
+    }
+}
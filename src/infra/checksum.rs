@@ -1,15 +1,29 @@
 //! SHA256 checksum implementation.
 
 use std::fs::File;
-use std::io::{BufReader, Read};
+use std::io::{self, Read};
 use std::path::Path;
+use std::sync::mpsc;
+use std::thread;
 
 use sha2::{Digest, Sha256};
 
 use crate::core::infra::Checksum;
 use crate::core::types::Result;
 
+/// Files smaller than this are read into memory in one go before hashing.
+const SMALL_FILE_LIMIT: u64 = 1 << 20;
+
+/// Size of each read when hashing a large file.
+const READ_CHUNK_SIZE: usize = 1 << 20;
+
 /// Checksum calculator using SHA256.
+///
+/// On x86/x86_64 the `sha2` crate detects the SHA extensions (SHA-NI) at
+/// run time and uses them when present, falling back to portable code.
+/// Other targets, including aarch64, use the portable implementation: the
+/// ARMv8 SHA2 instructions are only used with `sha2`'s `asm` feature, which
+/// this crate doesn't enable.
 #[derive(Debug, Clone, Default)]
 pub struct Sha2Checksum;
 
@@ -24,27 +38,87 @@ impl Checksum for Sha2Checksum {
     fn sha256(&self, content: &[u8]) -> String {
         let mut hasher = Sha256::new();
         hasher.update(content);
-        let result = hasher.finalize();
-        format!("{:x}", result)
+        to_hex(&hasher.finalize())
     }
 
     fn sha256_file(&self, path: &Path) -> Result<String> {
-        let file = File::open(path)?;
-        let mut reader = BufReader::new(file);
+        let mut file = File::open(path)?;
         let mut hasher = Sha256::new();
-        let mut buffer = [0u8; 8192];
 
-        loop {
-            let bytes_read = reader.read(&mut buffer)?;
-            if bytes_read == 0 {
-                break;
-            }
-            hasher.update(&buffer[..bytes_read]);
+        if file.metadata()?.len() < SMALL_FILE_LIMIT {
+            // Small files (nearly all of them) are read with a single call
+            let mut content = Vec::new();
+            file.read_to_end(&mut content)?;
+            hasher.update(&content);
+        } else {
+            hash_pipelined(&mut file, &mut hasher)?;
         }
 
-        let result = hasher.finalize();
-        Ok(format!("{:x}", result))
+        Ok(to_hex(&hasher.finalize()))
+    }
+}
+
+/// Encode a digest as lowercase hex.
+///
+/// Writes the digits straight into a buffer of the final size instead of
+/// going through the `fmt` machinery one byte at a time.
+pub(crate) fn to_hex(bytes: &[u8]) -> String {
+    const DIGITS: &[u8; 16] = b"0123456789abcdef";
+    let mut hex = String::with_capacity(bytes.len() * 2);
+    for &byte in bytes {
+        hex.push(DIGITS[usize::from(byte >> 4)] as char);
+        hex.push(DIGITS[usize::from(byte & 0x0f)] as char);
+    }
+    hex
+}
+
+/// Hash a file while a reader thread fetches the next chunk.
+///
+/// Two buffers circulate between the threads: while one is being hashed
+/// the other is being filled, so disk waits overlap with compression
+/// instead of alternating with it.
+fn hash_pipelined(file: &mut File, hasher: &mut Sha256) -> io::Result<()> {
+    let (filled_tx, filled_rx) = mpsc::sync_channel::<io::Result<Vec<u8>>>(1);
+    let (empty_tx, empty_rx) = mpsc::channel::<Vec<u8>>();
+    for _ in 0..2 {
+        empty_tx.send(vec![0; READ_CHUNK_SIZE]).expect("receiver is alive");
     }
+
+    // Everything is moved into the scope closure so the return channel is
+    // dropped on early exit, letting the reader finish before the join
+    thread::scope(move |scope| {
+        scope.spawn(move || {
+            while let Ok(mut buf) = empty_rx.recv() {
+                buf.resize(READ_CHUNK_SIZE, 0);
+                let read = loop {
+                    match file.read(&mut buf) {
+                        Err(e) if e.kind() == io::ErrorKind::Interrupted => continue,
+                        result => break result,
+                    }
+                };
+                let chunk = match read {
+                    Ok(0) => break,
+                    Ok(n) => {
+                        buf.truncate(n);
+                        Ok(buf)
+                    }
+                    Err(e) => Err(e),
+                };
+                let failed = chunk.is_err();
+                if filled_tx.send(chunk).is_err() || failed {
+                    break;
+                }
+            }
+        });
+
+        for chunk in filled_rx {
+            let chunk = chunk?;
+            hasher.update(&chunk);
+            // The reader may already have stopped at end of file
+            let _ = empty_tx.send(chunk);
+        }
+        Ok(())
+    })
 }
 
 #[cfg(test)]
@@ -121,6 +195,40 @@ mod tests {
         assert_eq!(result.len(), 64);
     }
 
+    #[test]
+    fn test_sha256_file_above_small_file_limit() {
+        let checksum = Sha2Checksum::new();
+        let mut temp_file = NamedTempFile::new().unwrap();
+        let data = vec![b'y'; SMALL_FILE_LIMIT as usize + 1];
+        temp_file.write_all(&data).unwrap();
+        temp_file.flush().unwrap();
+
+        // Pipelined and one-shot hashing must agree
+        let result = checksum.sha256_file(temp_file.path()).unwrap();
+        assert_eq!(result, checksum.sha256(&data));
+    }
+
+    #[test]
+    fn test_sha256_file_spanning_several_chunks() {
+        let checksum = Sha2Checksum::new();
+        let mut temp_file = NamedTempFile::new().unwrap();
+        let data: Vec<u8> = (0..READ_CHUNK_SIZE * 3 + 17).map(|i| (i % 251) as u8).collect();
+        temp_file.write_all(&data).unwrap();
+        temp_file.flush().unwrap();
+
+        let result = checksum.sha256_file(temp_file.path()).unwrap();
+        assert_eq!(result, checksum.sha256(&data));
+    }
+
+    #[test]
+    fn test_to_hex() {
+        assert_eq!(to_hex(&[]), "");
+        assert_eq!(to_hex(&[0x00, 0x0f, 0xab, 0xff]), "000fabff");
+
+        let digest = Sha256::digest(b"hello world");
+        assert_eq!(to_hex(&digest), format!("{:x}", digest));
+    }
+
     #[test]
     fn test_sha256_file_not_found() {
         let checksum = Sha2Checksum::new();
@@ -141,6 +249,56 @@ mod tests {
         );
     }
 
+    #[test]
+    fn test_sha256_files_small_batch_stays_on_calling_thread() {
+        struct ThreadRecorder(std::sync::Mutex<Vec<std::thread::ThreadId>>);
+
+        impl Checksum for ThreadRecorder {
+            fn sha256(&self, _content: &[u8]) -> String {
+                String::new()
+            }
+
+            fn sha256_file(&self, _path: &Path) -> Result<String> {
+                self.0.lock().unwrap().push(std::thread::current().id());
+                Ok(String::new())
+            }
+        }
+
+        let recorder = ThreadRecorder(std::sync::Mutex::new(Vec::new()));
+        let paths = [Path::new("a"), Path::new("b"), Path::new("c")];
+        recorder.sha256_files(&paths);
+
+        let threads = recorder.0.into_inner().unwrap();
+        assert_eq!(threads, vec![std::thread::current().id(); 3]);
+    }
+
+    #[test]
+    fn test_sha256_files_preserves_order() {
+        let checksum = Sha2Checksum::new();
+        let temp_dir = tempfile::TempDir::new().unwrap();
+        let paths: Vec<_> = (0..17)
+            .map(|i| {
+                let path = temp_dir.path().join(format!("file{}.txt", i));
+                std::fs::write(&path, format!("content {}", i)).unwrap();
+                path
+            })
+            .collect();
+        let missing = temp_dir.path().join("missing.txt");
+
+        let mut refs: Vec<&Path> = paths.iter().map(|p| p.as_path()).collect();
+        refs.insert(5, &missing);
+        let results = checksum.sha256_files(&refs);
+
+        assert_eq!(results.len(), refs.len());
+        for (path, result) in refs.iter().zip(&results) {
+            if *path == missing {
+                assert!(result.is_err());
+            } else {
+                assert_eq!(result.as_ref().unwrap(), &checksum.sha256_file(path).unwrap());
+            }
+        }
+    }
+
     #[test]
     fn test_sha256_consistency() {
         let checksum = Sha2Checksum::new();
@@ -4,7 +4,6 @@ use std::path::{Path, PathBuf};
 
 use async_trait::async_trait;
 use tokio::fs;
-use tokio::io::AsyncWriteExt;
 
 use crate::core::infra::FileSystem;
 use crate::core::types::Result;
@@ -30,10 +29,9 @@ impl FileSystem for StdFileSystem {
         if let Some(parent) = path.parent() {
             fs::create_dir_all(parent).await?;
         }
-        let mut file = fs::File::create(path).await?;
-        file.write_all(content.as_bytes()).await?;
-        file.flush().await?;
-        Ok(())
+        // One blocking-pool hop for the whole file, rather than one per
+        // buffered chunk through `tokio::fs::File`
+        Ok(fs::write(path, content).await?)
     }
 
     fn exists(&self, path: &Path) -> bool {
@@ -48,6 +46,10 @@ impl FileSystem for StdFileSystem {
         path.is_file()
     }
 
+    fn file_size(&self, path: &Path) -> Option<u64> {
+        std::fs::metadata(path).ok().map(|metadata| metadata.len())
+    }
+
     async fn create_dir_all(&self, path: &Path) -> Result<()> {
         Ok(fs::create_dir_all(path).await?)
     }
@@ -68,6 +70,14 @@ impl FileSystem for StdFileSystem {
         fs::copy(from, to).await?;
         Ok(())
     }
+
+    async fn rename(&self, from: &Path, to: &Path) -> Result<()> {
+        Ok(fs::rename(from, to).await?)
+    }
+
+    async fn remove_dir_all(&self, path: &Path) -> Result<()> {
+        Ok(fs::remove_dir_all(path).await?)
+    }
 }
 
 #[cfg(test)]
@@ -251,4 +261,43 @@ mod tests {
         let content = fs.read(&file_path).await.unwrap();
         assert_eq!(content, unicode_text);
     }
+
+    #[tokio::test]
+    async fn test_file_size() {
+        let fs = StdFileSystem::new();
+        let temp_dir = TempDir::new().unwrap();
+        let file_path = temp_dir.path().join("sized.txt");
+
+        fs.write(&file_path, "12345").await.unwrap();
+
+        assert_eq!(fs.file_size(&file_path), Some(5));
+        assert_eq!(fs.file_size(&temp_dir.path().join("missing.txt")), None);
+    }
+
+    #[tokio::test]
+    async fn test_rename_directory() {
+        let fs = StdFileSystem::new();
+        let temp_dir = TempDir::new().unwrap();
+        let from = temp_dir.path().join("staging");
+        let to = temp_dir.path().join("final");
+
+        fs.write(&from.join("nested/file.txt"), "moved").await.unwrap();
+        fs.rename(&from, &to).await.unwrap();
+
+        assert!(!fs.exists(&from));
+        let content = fs.read(&to.join("nested/file.txt")).await.unwrap();
+        assert_eq!(content, "moved");
+    }
+
+    #[tokio::test]
+    async fn test_remove_dir_all() {
+        let fs = StdFileSystem::new();
+        let temp_dir = TempDir::new().unwrap();
+        let dir = temp_dir.path().join("doomed");
+
+        fs.write(&dir.join("a/b/file.txt"), "gone").await.unwrap();
+        fs.remove_dir_all(&dir).await.unwrap();
+
+        assert!(!fs.exists(&dir));
+    }
 }
@@ -1,33 +1,51 @@
 //! HTTP client implementation using reqwest.
 
 use std::path::Path;
+use std::sync::OnceLock;
+use std::time::Duration;
 
 use async_trait::async_trait;
+use sha2::{Digest, Sha256};
 use tokio::fs::File;
 use tokio::io::AsyncWriteExt;
 
+use super::checksum::to_hex;
 use crate::core::infra::HttpClient;
-use crate::core::types::{Error, Result};
+use crate::core::types::{Error, FetchResult, Result};
 
 /// HTTP client implementation using reqwest.
+///
+/// The underlying `reqwest::Client` (TLS configuration, connection pool) is
+/// built on first use, so commands that never hit the network don't pay for it.
+/// A single instance is shared by every request of a command, so downloads
+/// reuse pooled keep-alive connections instead of a TLS handshake per file.
 #[derive(Debug, Clone)]
 pub struct ReqwestClient {
-    client: reqwest::Client,
+    client: OnceLock<reqwest::Client>,
 }
 
 impl ReqwestClient {
     /// Create a new ReqwestClient instance.
     pub fn new() -> Self {
         Self {
-            client: reqwest::Client::builder()
+            client: OnceLock::new(),
+        }
+    }
+
+    /// Get the underlying client, building it on first call.
+    fn client(&self) -> &reqwest::Client {
+        self.client.get_or_init(|| {
+            reqwest::Client::builder()
                 .user_agent(concat!(
                     env!("CARGO_PKG_NAME"),
                     "/",
                     env!("CARGO_PKG_VERSION")
                 ))
+                .connect_timeout(Duration::from_secs(30))
+                .tcp_keepalive(Duration::from_secs(60))
                 .build()
-                .expect("Failed to create HTTP client"),
-        }
+                .expect("Failed to create HTTP client")
+        })
     }
 }
 
@@ -41,7 +59,7 @@ impl Default for ReqwestClient {
 impl HttpClient for ReqwestClient {
     async fn get(&self, url: &str) -> Result<String> {
         let response = self
-            .client
+            .client()
             .get(url)
             .send()
             .await
@@ -63,7 +81,7 @@ impl HttpClient for ReqwestClient {
 
     async fn get_bytes(&self, url: &str) -> Result<Vec<u8>> {
         let response = self
-            .client
+            .client()
             .get(url)
             .send()
             .await
@@ -84,16 +102,74 @@ impl HttpClient for ReqwestClient {
             .map_err(|e| Error::Network(e.to_string()))
     }
 
-    async fn download(&self, url: &str, dest: &Path) -> Result<()> {
-        let bytes = self.get_bytes(url).await?;
+    async fn get_conditional(&self, url: &str, etag: Option<&str>) -> Result<FetchResult> {
+        let mut request = self.client().get(url);
+        if let Some(etag) = etag {
+            request = request.header(reqwest::header::IF_NONE_MATCH, etag);
+        }
+
+        let response = request
+            .send()
+            .await
+            .map_err(|e| Error::Network(e.to_string()))?;
+
+        if response.status() == reqwest::StatusCode::NOT_MODIFIED {
+            return Ok(FetchResult::NotModified);
+        }
+
+        if !response.status().is_success() {
+            return Err(Error::Network(format!(
+                "HTTP {} for {}",
+                response.status(),
+                url
+            )));
+        }
+
+        let etag = response
+            .headers()
+            .get(reqwest::header::ETAG)
+            .and_then(|value| value.to_str().ok())
+            .map(str::to_string);
+        let body = response
+            .text()
+            .await
+            .map_err(|e| Error::Network(e.to_string()))?;
+
+        Ok(FetchResult::Modified { body, etag })
+    }
+
+    async fn download(&self, url: &str, dest: &Path) -> Result<String> {
+        let mut response = self
+            .client()
+            .get(url)
+            .send()
+            .await
+            .map_err(|e| Error::Network(e.to_string()))?;
+
+        if !response.status().is_success() {
+            return Err(Error::Network(format!(
+                "HTTP {} for {}",
+                response.status(),
+                url
+            )));
+        }
 
         if let Some(parent) = dest.parent() {
             tokio::fs::create_dir_all(parent).await?;
         }
 
+        // Write (and hash) the body as it arrives instead of buffering all of it
         let mut file = File::create(dest).await?;
-        file.write_all(&bytes).await?;
+        let mut hasher = Sha256::new();
+        while let Some(chunk) = response
+            .chunk()
+            .await
+            .map_err(|e| Error::Network(e.to_string()))?
+        {
+            hasher.update(&chunk);
+            file.write_all(&chunk).await?;
+        }
         file.flush().await?;
-        Ok(())
+        Ok(to_hex(&hasher.finalize()))
     }
 }
@@ -42,11 +42,15 @@ impl Logger for ColoredLogger {
     }
 
     fn debug(&self, msg: &str) {
-        if self.verbosity >= 2 {
+        if self.is_debug_enabled() {
             println!("{} {}", "[DEBUG]".dimmed(), msg);
         }
     }
 
+    fn is_debug_enabled(&self) -> bool {
+        self.verbosity >= 2
+    }
+
     fn success(&self, msg: &str) {
         if self.verbosity >= 1 {
             println!("{} {}", "[OK]".green(), msg);
@@ -8,13 +8,16 @@
 //! - [`StdFileSystem`] - File system using standard library
 //! - [`ReqwestClient`] - HTTP client using reqwest
 //! - [`Sha2Checksum`] - SHA256 checksum using sha2
+//! - [`CachingChecksum`] - Checksum decorator remembering file hashes
 //! - [`ColoredLogger`] - Colored terminal output
 
+mod caching_checksum;
 mod checksum;
 mod fs;
 mod http;
 mod logger;
 
+pub use caching_checksum::CachingChecksum;
 pub use checksum::Sha2Checksum;
 pub use fs::StdFileSystem;
 pub use http::ReqwestClient;
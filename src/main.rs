@@ -15,7 +15,9 @@ use aiassisted::config::{
 };
 use aiassisted::content::{CheckCommand, InstallCommand, UpdateCommand};
 use aiassisted::core::infra::{Checksum, FileSystem, HttpClient, Logger};
-use aiassisted::infra::{ColoredLogger, ReqwestClient, Sha2Checksum, StdFileSystem};
+use aiassisted::infra::{
+    CachingChecksum, ColoredLogger, ReqwestClient, Sha2Checksum, StdFileSystem,
+};
 use aiassisted::migration::MigrateCommand;
 use aiassisted::selfupdate::{GithubReleasesProvider, SelfUpdateCommand};
 use aiassisted::skills::{SetupSkillsCommand, SkillsListCommand, SkillsUpdateCommand};
@@ -52,15 +54,60 @@ where
     }
 }
 
-#[tokio::main]
-async fn main() {
+fn main() {
+    // A bare `aiassisted version` needs neither argument parsing nor the
+    // async runtime, so answer it straight from argv
+    if is_bare_version(std::env::args_os()) {
+        print_version();
+        return;
+    }
+
     let cli = Cli::parse();
+
+    // `version` needs no infrastructure, so answer it before any is built
+    if matches!(cli.command, Commands::Version) {
+        print_version();
+        return;
+    }
+
+    // Commands are I/O-bound and run one at a time, so a single-threaded
+    // runtime avoids starting a worker thread per core at startup; blocking
+    // file I/O still goes to tokio's blocking pool
+    tokio::runtime::Builder::new_current_thread()
+        .enable_all()
+        .build()
+        .expect("Failed to start async runtime")
+        .block_on(run(cli));
+}
+
+/// Check whether the arguments are exactly `<program> version`.
+fn is_bare_version<I>(args: I) -> bool
+where
+    I: IntoIterator<Item = std::ffi::OsString>,
+{
+    let mut args = args.into_iter().skip(1);
+    matches!((args.next(), args.next()), (Some(arg), None) if arg == "version")
+}
+
+/// Version line, assembled at compile time.
+const VERSION_LINE: &str = concat!("aiassisted ", env!("CARGO_PKG_VERSION"), "\n");
+
+/// Print the version line with a single write.
+fn print_version() {
+    use std::io::Write;
+
+    // Unlike `println!`, don't panic if stdout is a closed pipe
+    let _ = std::io::stdout().lock().write_all(VERSION_LINE.as_bytes());
+}
+
+/// Run a parsed command.
+async fn run(cli: Cli) {
     let verbosity = cli.verbose.max(1); // Default to 1 if not specified
 
     // Create infrastructure with concrete types (static dispatch)
     let fs = StdFileSystem::new();
     let http = ReqwestClient::new();
-    let checksum = Sha2Checksum::new();
+    let checksum = CachingChecksum::default_location(Sha2Checksum::new());
     let logger = ColoredLogger::new(verbosity);
 
     let ctx = AppContext::new(fs, http, checksum, logger);
@@ -82,7 +129,10 @@ async fn main() {
         }
 
         Commands::Check(args) => {
-            let cmd = CheckCommand { path: args.path };
+            let cmd = CheckCommand {
+                path: args.path,
+                no_cache: args.no_cache,
+            };
             cmd.execute(&ctx.fs, &ctx.http, &ctx.logger).await
         }
 
@@ -224,15 +274,38 @@ async fn main() {
         }
         .await,
 
-        Commands::Version => {
-            println!("aiassisted {}", env!("CARGO_PKG_VERSION"));
-            Ok(())
-        }
+        Commands::Version => unreachable!("version is handled before setup"),
     };
 
+    // Remember file hashes for the next run; losing them only costs time
+    if let Err(e) = ctx.checksum.save() {
+        if ctx.logger.is_debug_enabled() {
+            ctx.logger.debug(&format!("Could not save file hash cache: {}", e));
+        }
+    }
+
     // Handle errors
     if let Err(e) = result {
         ctx.logger.error(&format!("Error: {}", e));
         std::process::exit(1);
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::ffi::OsString;
+
+    fn args(list: &[&str]) -> Vec<OsString> {
+        list.iter().map(OsString::from).collect()
+    }
+
+    #[test]
+    fn test_is_bare_version() {
+        assert!(is_bare_version(args(&["aiassisted", "version"])));
+        assert!(!is_bare_version(args(&["aiassisted"])));
+        assert!(!is_bare_version(args(&["aiassisted", "version", "--verbose"])));
+        assert!(!is_bare_version(args(&["aiassisted", "-v", "version"])));
+        assert!(!is_bare_version(args(&["aiassisted", "install"])));
+    }
+}
@@ -196,11 +196,13 @@ impl SelfUpdateCommand {
         let current_exe = env::current_exe()
             .map_err(Error::from)?;
 
-        logger.debug(&format!(
-            "Replacing {} with {}",
-            current_exe.display(),
-            new_binary.display()
-        ));
+        if logger.is_debug_enabled() {
+            logger.debug(&format!(
+                "Replacing {} with {}",
+                current_exe.display(),
+                new_binary.display()
+            ));
+        }
 
         // On Windows, we can't replace a running executable directly.
         // On Unix, we can use atomic rename.
@@ -3,6 +3,7 @@
 use async_trait::async_trait;
 use serde::Deserialize;
 use std::path::Path;
+use tokio::sync::OnceCell;
 
 use crate::core::infra::HttpClient;
 use crate::core::selfupdate::ReleaseProvider;
@@ -29,17 +30,27 @@ struct GitHubAsset {
 }
 
 /// GitHub Releases provider for self-updates.
+///
+/// The latest release is fetched from the API once and reused, so checking
+/// for an update and then downloading it costs a single API request.
 pub struct GithubReleasesProvider<H: HttpClient> {
     http: H,
     platform: Platform,
+    latest: OnceCell<ReleaseInfo>,
 }
 
 impl<H: HttpClient> GithubReleasesProvider<H> {
     /// Create a new GitHub Releases provider.
     pub fn new(http: H) -> Self {
+        Self::with_platform(http, Platform::detect())
+    }
+
+    /// Create a provider for a specific platform.
+    fn with_platform(http: H, platform: Platform) -> Self {
         Self {
             http,
-            platform: Platform::detect(),
+            platform,
+            latest: OnceCell::new(),
         }
     }
 
@@ -57,6 +68,34 @@ impl<H: HttpClient> GithubReleasesProvider<H> {
             .map_err(|e| Error::Parse(format!("Failed to parse GitHub release: {}", e)))
     }
 
+    /// Get the SHA256 checksum published next to `asset`, if any.
+    ///
+    /// cargo-dist uploads a `<asset>.sha256` file (`<hex digest>  <name>`)
+    /// for every archive; releases without one yield `None`.
+    async fn fetch_asset_checksum(
+        &self,
+        release: &GitHubRelease,
+        asset: &GitHubAsset,
+    ) -> Result<Option<String>> {
+        let checksum_name = format!("{}.sha256", asset.name);
+        let Some(checksum_asset) = release.assets.iter().find(|a| a.name == checksum_name) else {
+            return Ok(None);
+        };
+
+        let content = self
+            .http
+            .get(&checksum_asset.browser_download_url)
+            .await
+            .map_err(|e| Error::Network(format!("Failed to fetch release checksum: {}", e)))?;
+
+        content
+            .split_whitespace()
+            .next()
+            .filter(|digest| digest.len() == 64 && digest.bytes().all(|b| b.is_ascii_hexdigit()))
+            .map(|digest| Some(digest.to_string()))
+            .ok_or_else(|| Error::Parse(format!("Invalid checksum file {}", checksum_name)))
+    }
+
     /// Find the asset matching the current platform.
     fn find_platform_asset<'a>(&self, release: &'a GitHubRelease) -> Result<&'a GitHubAsset> {
         let asset_name = self.platform.asset_name();
@@ -79,14 +118,20 @@ impl<H: HttpClient> GithubReleasesProvider<H> {
 #[async_trait]
 impl<H: HttpClient> ReleaseProvider for GithubReleasesProvider<H> {
     async fn get_latest(&self) -> Result<ReleaseInfo> {
-        let release = self.fetch_latest_release().await?;
-        let asset = self.find_platform_asset(&release)?;
-
-        Ok(ReleaseInfo {
-            version: release.tag_name.clone(),
-            download_url: asset.browser_download_url.clone(),
-            checksum: None, // GitHub doesn't provide checksums in the API response
-        })
+        self.latest
+            .get_or_try_init(|| async {
+                let release = self.fetch_latest_release().await?;
+                let asset = self.find_platform_asset(&release)?;
+                let checksum = self.fetch_asset_checksum(&release, asset).await?;
+
+                Ok::<_, Error>(ReleaseInfo {
+                    version: release.tag_name.clone(),
+                    download_url: asset.browser_download_url.clone(),
+                    checksum,
+                })
+            })
+            .await
+            .cloned()
     }
 
     async fn is_update_available(&self, current_version: &str) -> Result<bool> {
@@ -95,10 +140,21 @@ impl<H: HttpClient> ReleaseProvider for GithubReleasesProvider<H> {
     }
 
     async fn download_release(&self, release: &ReleaseInfo, dest: &Path) -> Result<()> {
-        self.http
+        let actual_checksum = self
+            .http
             .download(&release.download_url, dest)
             .await
-            .map_err(|e| Error::Network(format!("Failed to download release: {}", e)))
+            .map_err(|e| Error::Network(format!("Failed to download release: {}", e)))?;
+
+        match &release.checksum {
+            Some(expected) if !expected.eq_ignore_ascii_case(&actual_checksum) => {
+                Err(Error::ChecksumMismatch {
+                    expected: expected.clone(),
+                    actual: actual_checksum,
+                })
+            }
+            _ => Ok(()),
+        }
     }
 }
 
@@ -117,7 +173,7 @@ mod tests {
         impl HttpClient for HttpClient {
             async fn get(&self, url: &str) -> Result<String>;
             async fn get_bytes(&self, url: &str) -> Result<Vec<u8>>;
-            async fn download(&self, url: &str, dest: &Path) -> Result<()>;
+            async fn download(&self, url: &str, dest: &Path) -> Result<String>;
         }
     }
 
@@ -141,13 +197,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await.unwrap();
 
@@ -165,13 +221,13 @@ mod tests {
             .times(1)
             .returning(|_| Err(Error::Network("Connection failed".to_string())));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await;
 
@@ -188,13 +244,13 @@ mod tests {
             .times(1)
             .returning(|_| Ok("invalid json".to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await;
 
@@ -221,13 +277,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await;
 
@@ -254,19 +310,128 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.is_update_available("v1.0.0").await.unwrap();
 
         assert!(result);
     }
 
+    #[tokio::test]
+    async fn test_latest_release_fetched_once() {
+        let mut mock_http = MockHttpClient::new();
+
+        let response = r#"{
+            "tag_name": "v2.0.0",
+            "assets": [
+                {
+                    "name": "aiassisted-x86_64-unknown-linux-gnu.tar.gz",
+                    "browser_download_url": "https://github.com/example/repo/releases/download/v2.0.0/binary.tar.gz"
+                }
+            ]
+        }"#;
+
+        mock_http
+            .expect_get()
+            .times(1)
+            .returning(move |_| Ok(response.to_string()));
+
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
+                os: "linux".to_string(),
+                arch: "x86_64".to_string(),
+            },
+        );
+
+        assert!(provider.is_update_available("v1.0.0").await.unwrap());
+        let release = provider.get_latest().await.unwrap();
+
+        assert_eq!(release.version, "v2.0.0");
+    }
+
+    #[tokio::test]
+    async fn test_get_latest_reads_published_checksum() {
+        let mut mock_http = MockHttpClient::new();
+
+        let response = r#"{
+            "tag_name": "v2.0.0",
+            "assets": [
+                {
+                    "name": "aiassisted-x86_64-unknown-linux-gnu.tar.gz",
+                    "browser_download_url": "https://example.com/v2.0.0/aiassisted-x86_64-unknown-linux-gnu.tar.gz"
+                },
+                {
+                    "name": "aiassisted-x86_64-unknown-linux-gnu.tar.gz.sha256",
+                    "browser_download_url": "https://example.com/v2.0.0/aiassisted-x86_64-unknown-linux-gnu.tar.gz.sha256"
+                }
+            ]
+        }"#;
+        let digest = "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9";
+
+        mock_http.expect_get().times(2).returning(move |url| {
+            if url.ends_with(".sha256") {
+                Ok(format!("{}  aiassisted-x86_64-unknown-linux-gnu.tar.gz\n", digest))
+            } else {
+                Ok(response.to_string())
+            }
+        });
+
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
+                os: "linux".to_string(),
+                arch: "x86_64".to_string(),
+            },
+        );
+
+        let release = provider.get_latest().await.unwrap();
+        assert_eq!(release.checksum.as_deref(), Some(digest));
+    }
+
+    #[tokio::test]
+    async fn test_get_latest_rejects_malformed_checksum() {
+        let mut mock_http = MockHttpClient::new();
+
+        let response = r#"{
+            "tag_name": "v2.0.0",
+            "assets": [
+                {
+                    "name": "aiassisted-x86_64-unknown-linux-gnu.tar.gz",
+                    "browser_download_url": "https://example.com/binary.tar.gz"
+                },
+                {
+                    "name": "aiassisted-x86_64-unknown-linux-gnu.tar.gz.sha256",
+                    "browser_download_url": "https://example.com/binary.tar.gz.sha256"
+                }
+            ]
+        }"#;
+
+        mock_http.expect_get().times(2).returning(move |url| {
+            if url.ends_with(".sha256") {
+                Ok("<html>Not Found</html>".to_string())
+            } else {
+                Ok(response.to_string())
+            }
+        });
+
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
+                os: "linux".to_string(),
+                arch: "x86_64".to_string(),
+            },
+        );
+
+        assert!(provider.get_latest().await.is_err());
+    }
+
     #[tokio::test]
     async fn test_is_update_available_same_version() {
         let mut mock_http = MockHttpClient::new();
@@ -286,13 +451,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.is_update_available("v1.0.0").await.unwrap();
 
@@ -318,13 +483,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.is_update_available("v2.0.0").await.unwrap();
 
@@ -339,15 +504,15 @@ mod tests {
             .expect_download()
             .withf(|url, _| url.contains("github.com"))
             .times(1)
-            .returning(|_, _| Ok(()));
+            .returning(|_, _| Ok("abc123".to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let release = ReleaseInfo {
             version: "v1.2.3".to_string(),
@@ -371,13 +536,13 @@ mod tests {
             .times(1)
             .returning(|_, _| Err(Error::Network("Download failed".to_string())));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "linux".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let release = ReleaseInfo {
             version: "v1.2.3".to_string(),
@@ -393,6 +558,41 @@ mod tests {
         assert!(matches!(result.unwrap_err(), Error::Network(_)));
     }
 
+    #[tokio::test]
+    async fn test_download_release_verifies_checksum() {
+        let mut mock_http = MockHttpClient::new();
+
+        mock_http
+            .expect_download()
+            .times(2)
+            .returning(|_, _| Ok("abc123".to_string()));
+
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
+                os: "linux".to_string(),
+                arch: "x86_64".to_string(),
+            },
+        );
+
+        let mut release = ReleaseInfo {
+            version: "v1.2.3".to_string(),
+            download_url: "https://github.com/example/repo/releases/download/v1.2.3/binary.tar.gz"
+                .to_string(),
+            checksum: Some("ABC123".to_string()),
+        };
+        let dest = PathBuf::from("/tmp/binary.tar.gz");
+
+        assert!(provider.download_release(&release, &dest).await.is_ok());
+
+        release.checksum = Some("def456".to_string());
+        let result = provider.download_release(&release, &dest).await;
+        assert!(matches!(
+            result.unwrap_err(),
+            Error::ChecksumMismatch { expected, actual } if expected == "def456" && actual == "abc123"
+        ));
+    }
+
     #[tokio::test]
     async fn test_macos_platform_asset() {
         let mut mock_http = MockHttpClient::new();
@@ -412,13 +612,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "macos".to_string(),
                 arch: "aarch64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await.unwrap();
 
@@ -444,13 +644,13 @@ mod tests {
             .times(1)
             .returning(move |_| Ok(response.to_string()));
 
-        let provider = GithubReleasesProvider {
-            http: mock_http,
-            platform: Platform {
+        let provider = GithubReleasesProvider::with_platform(
+            mock_http,
+            Platform {
                 os: "windows".to_string(),
                 arch: "x86_64".to_string(),
             },
-        };
+        );
 
         let result = provider.get_latest().await.unwrap();
 
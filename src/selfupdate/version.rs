@@ -18,17 +18,18 @@ pub fn is_newer_version(current: &str, latest: &str) -> bool {
 ///
 /// Handles both "v1.2.3" and "1.2.3" formats.
 fn parse_version(version: &str) -> Option<(u32, u32, u32)> {
-    let version = version.trim_start_matches('v');
-    let parts: Vec<&str> = version.split('.').collect();
+    // Walk the components in place rather than collecting them
+    let mut parts = version.trim_start_matches('v').split('.');
 
-    if parts.len() != 3 {
+    let major = parts.next()?.parse::<u32>().ok()?;
+    let minor = parts.next()?.parse::<u32>().ok()?;
+    let patch = parts.next()?.parse::<u32>().ok()?;
+
+    // Exactly three components
+    if parts.next().is_some() {
         return None;
     }
 
-    let major = parts[0].parse::<u32>().ok()?;
-    let minor = parts[1].parse::<u32>().ok()?;
-    let patch = parts[2].parse::<u32>().ok()?;
-
     Some((major, minor, patch))
 }
 
@@ -51,6 +52,8 @@ mod tests {
         assert_eq!(parse_version("1.2"), None);
         assert_eq!(parse_version("1.2.3.4"), None);
         assert_eq!(parse_version("abc"), None);
+        assert_eq!(parse_version(""), None);
+        assert_eq!(parse_version("1.2."), None);
     }
 
     #[test]
@@ -1,6 +1,6 @@
 //! Skill directory copying
 
-use crate::core::infra::FileSystem;
+use crate::core::infra::{has_marker_file, FileSystem};
 use crate::core::types::{Error, Result};
 use std::future::Future;
 use std::path::Path;
@@ -36,8 +36,7 @@ impl<'a, F: FileSystem> SkillCopier<'a, F> {
         let entries = self.fs.list_dir(source_dir).await?;
 
         for entry in entries {
-            let skill_md = entry.join("SKILL.md");
-            if self.fs.is_dir(&entry) && self.fs.exists(&skill_md) {
+            if has_marker_file(self.fs, &entry, "SKILL.md") {
                 let name = entry
                     .file_name()
                     .and_then(|n| n.to_str())
@@ -1,6 +1,6 @@
 //! Skill diff computation using SHA256 checksums
 
-use crate::core::infra::{Checksum, FileSystem};
+use crate::core::infra::{has_marker_file, Checksum, FileSystem};
 use crate::core::types::Result;
 use std::collections::HashMap;
 use std::future::Future;
@@ -122,6 +122,14 @@ impl SkillsUpdateDiff {
     }
 }
 
+/// File diff of one skill whose checksum comparisons are still pending
+struct PendingSkillFiles {
+    /// Files of the skill, sorted by relative path
+    files: Vec<SkillFileInfo>,
+    /// Indices into `files` whose source and target still have to be hashed
+    to_hash: Vec<usize>,
+}
+
 /// Computes diffs between source and target skills using SHA256 checksums
 pub struct SkillDiffer<'a, F: FileSystem, C: Checksum> {
     fs: &'a F,
@@ -167,26 +175,17 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
         };
 
         // Process source skills
+        let mut pending = Vec::new();
         for (name, source_path) in &source_names {
             let target_path = target_dir.join(name);
 
             if let Some(existing_target) = target_names.get(name) {
-                // Skill exists in both - compute file diffs
+                // Skill exists in both - compute file diffs once all skills
+                // have been paired
                 let files = self
                     .compute_skill_files_diff(source_path, existing_target)
                     .await?;
-
-                let status = if files.iter().all(|f| f.status == FileStatus::Unchanged) {
-                    SkillStatus::Unchanged
-                } else {
-                    SkillStatus::Updated
-                };
-
-                skill_diffs.push(SkillDiff {
-                    name: name.clone(),
-                    status,
-                    files,
-                });
+                pending.push((name.clone(), files));
             } else {
                 // New skill - all files are new
                 let files = self.collect_all_files_as_new(source_path, &target_path).await?;
@@ -199,6 +198,24 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
             }
         }
 
+        // Hash the files of every skill in one parallel batch, rather than a
+        // batch per skill too small to be worth splitting across threads
+        self.resolve_checksums(&mut pending)?;
+        for (name, pending_files) in pending {
+            let files = pending_files.files;
+            let status = if files.iter().all(|f| f.status == FileStatus::Unchanged) {
+                SkillStatus::Unchanged
+            } else {
+                SkillStatus::Updated
+            };
+
+            skill_diffs.push(SkillDiff {
+                name,
+                status,
+                files,
+            });
+        }
+
         // Process removed skills (exist in target but not source)
         for name in target_names.keys() {
             if !source_names.contains_key(name) {
@@ -228,8 +245,7 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
         let entries = self.fs.list_dir(dir).await?;
 
         for entry in entries {
-            let skill_md = entry.join("SKILL.md");
-            if self.fs.is_dir(&entry) && self.fs.exists(&skill_md) {
+            if has_marker_file(self.fs, &entry, "SKILL.md") {
                 skills.push(entry);
             }
         }
@@ -238,11 +254,14 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
     }
 
     /// Compute file-level diff between source and target skill directories
+    ///
+    /// Files present on both sides with equal sizes are left `Unchanged`
+    /// and listed in `to_hash`, for `resolve_checksums` to compare.
     async fn compute_skill_files_diff(
         &self,
         source_skill: &Path,
         target_skill: &Path,
-    ) -> Result<Vec<SkillFileInfo>> {
+    ) -> Result<PendingSkillFiles> {
         let mut files = Vec::new();
 
         // Get all files in source
@@ -265,48 +284,94 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
             })
             .collect();
 
-        // Check source files
+        // Check source files. Files whose sizes differ have certainly
+        // changed and don't need hashing.
         for (rel_path, source_path) in &source_map {
-            let target_path = target_skill.join(rel_path);
-
-            let status = if let Some(existing_target) = target_map.get(rel_path) {
-                // File exists in both - compare checksums
-                let source_hash = self.checksum.sha256_file(source_path)?;
-                let target_hash = self.checksum.sha256_file(existing_target)?;
-
-                if source_hash == target_hash {
-                    FileStatus::Unchanged
-                } else {
-                    FileStatus::Modified
+            let (status, needs_hash) = match target_map.get(rel_path) {
+                Some(existing_target) => {
+                    let sizes = (
+                        self.fs.file_size(source_path),
+                        self.fs.file_size(existing_target),
+                    );
+                    match sizes {
+                        (Some(source_size), Some(target_size)) if source_size != target_size => {
+                            (FileStatus::Modified, false)
+                        }
+                        _ => (FileStatus::Unchanged, true),
+                    }
                 }
-            } else {
-                FileStatus::New
+                None => (FileStatus::New, false),
             };
 
-            files.push(SkillFileInfo {
-                relative_path: rel_path.clone(),
-                source_path: source_path.clone(),
-                target_path,
-                status,
-            });
+            files.push((
+                SkillFileInfo {
+                    relative_path: rel_path.clone(),
+                    source_path: source_path.clone(),
+                    target_path: target_skill.join(rel_path),
+                    status,
+                },
+                needs_hash,
+            ));
         }
 
         // Check for removed files (in target but not source)
         for (rel_path, target_path) in &target_map {
             if !source_map.contains_key(rel_path) {
-                files.push(SkillFileInfo {
-                    relative_path: rel_path.clone(),
-                    source_path: PathBuf::new(), // No source for removed files
-                    target_path: target_path.clone(),
-                    status: FileStatus::Removed,
-                });
+                files.push((
+                    SkillFileInfo {
+                        relative_path: rel_path.clone(),
+                        source_path: PathBuf::new(), // No source for removed files
+                        target_path: target_path.clone(),
+                        status: FileStatus::Removed,
+                    },
+                    false,
+                ));
             }
         }
 
         // Sort by relative path
-        files.sort_by(|a, b| a.relative_path.cmp(&b.relative_path));
+        files.sort_by(|(a, _), (b, _)| a.relative_path.cmp(&b.relative_path));
 
-        Ok(files)
+        let to_hash = files
+            .iter()
+            .enumerate()
+            .filter(|(_, (_, needs_hash))| *needs_hash)
+            .map(|(i, _)| i)
+            .collect();
+        Ok(PendingSkillFiles {
+            files: files.into_iter().map(|(file, _)| file).collect(),
+            to_hash,
+        })
+    }
+
+    /// Compare the pending files of every skill by checksum, hashing all of
+    /// them in one parallel batch
+    fn resolve_checksums(&self, pending: &mut [(String, PendingSkillFiles)]) -> Result<()> {
+        let hashes = {
+            let paths: Vec<&Path> = pending
+                .iter()
+                .flat_map(|(_, skill)| {
+                    skill.to_hash.iter().flat_map(move |&i| {
+                        let file = &skill.files[i];
+                        [file.source_path.as_path(), file.target_path.as_path()]
+                    })
+                })
+                .collect();
+            self.checksum.sha256_files(&paths)
+        };
+
+        let mut hashes = hashes.into_iter();
+        for (_, skill) in pending.iter_mut() {
+            for &i in &skill.to_hash {
+                let source_hash = hashes.next().expect("one checksum per path")?;
+                let target_hash = hashes.next().expect("one checksum per path")?;
+                if source_hash != target_hash {
+                    skill.files[i].status = FileStatus::Modified;
+                }
+            }
+        }
+
+        Ok(())
     }
 
     /// Collect all files for a new skill (mark all as New)
@@ -366,6 +431,129 @@ impl<'a, F: FileSystem, C: Checksum> SkillDiffer<'a, F, C> {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::infra::{Sha2Checksum, StdFileSystem};
+    use std::sync::Mutex;
+    use tempfile::TempDir;
+
+    /// Write `files` (relative path, content) under `dir`.
+    fn write_files(dir: &Path, files: &[(&str, &str)]) {
+        for (path, content) in files {
+            let path = dir.join(path);
+            std::fs::create_dir_all(path.parent().unwrap()).unwrap();
+            std::fs::write(path, content).unwrap();
+        }
+    }
+
+    /// Checksum that records which files it hashed, and in what batches.
+    #[derive(Default)]
+    struct RecordingChecksum {
+        inner: Sha2Checksum,
+        hashed: Mutex<Vec<PathBuf>>,
+        batch_sizes: Mutex<Vec<usize>>,
+    }
+
+    impl Checksum for RecordingChecksum {
+        fn sha256(&self, content: &[u8]) -> String {
+            self.inner.sha256(content)
+        }
+
+        fn sha256_file(&self, path: &Path) -> Result<String> {
+            self.hashed.lock().unwrap().push(path.to_path_buf());
+            self.inner.sha256_file(path)
+        }
+
+        fn sha256_files(&self, paths: &[&Path]) -> Vec<Result<String>> {
+            self.batch_sizes.lock().unwrap().push(paths.len());
+            paths.iter().map(|path| self.sha256_file(path)).collect()
+        }
+    }
+
+    #[tokio::test]
+    async fn test_compute_diff_file_statuses() {
+        let temp_dir = TempDir::new().unwrap();
+        let source = temp_dir.path().join("source");
+        let target = temp_dir.path().join("target");
+        write_files(
+            &source.join("my-skill"),
+            &[
+                ("SKILL.md", "skill"),
+                ("same.md", "same"),
+                ("edited.md", "new text"),
+                ("resized.md", "longer content"),
+                ("added.md", "added"),
+            ],
+        );
+        write_files(
+            &target.join("my-skill"),
+            &[
+                ("SKILL.md", "skill"),
+                ("same.md", "same"),
+                ("edited.md", "old text"),
+                ("resized.md", "short"),
+                ("stale.md", "stale"),
+            ],
+        );
+
+        let fs = StdFileSystem::new();
+        let checksum = RecordingChecksum::default();
+        let diff = SkillDiffer::new(&fs, &checksum)
+            .compute_diff(&source, &target)
+            .await
+            .unwrap();
+
+        let skill = &diff.skills[0];
+        let status = |name: &str| {
+            skill
+                .files
+                .iter()
+                .find(|f| f.relative_path == Path::new(name))
+                .map(|f| f.status.clone())
+        };
+        assert_eq!(skill.status, SkillStatus::Updated);
+        assert_eq!(status("same.md"), Some(FileStatus::Unchanged));
+        assert_eq!(status("edited.md"), Some(FileStatus::Modified));
+        assert_eq!(status("resized.md"), Some(FileStatus::Modified));
+        assert_eq!(status("added.md"), Some(FileStatus::New));
+        assert_eq!(status("stale.md"), Some(FileStatus::Removed));
+
+        // Files of different sizes are reported without being hashed
+        let hashed = checksum.hashed.into_inner().unwrap();
+        assert!(!hashed.iter().any(|path| path.ends_with("resized.md")));
+        assert!(hashed.iter().any(|path| path.ends_with("edited.md")));
+    }
+
+    #[tokio::test]
+    async fn test_compute_diff_hashes_all_skills_in_one_batch() {
+        let temp_dir = TempDir::new().unwrap();
+        let source = temp_dir.path().join("source");
+        let target = temp_dir.path().join("target");
+        for dir in [&source, &target] {
+            write_files(
+                dir,
+                &[
+                    ("first/SKILL.md", "first"),
+                    ("first/notes.md", "notes"),
+                    ("second/SKILL.md", "second"),
+                ],
+            );
+        }
+        write_files(&source, &[("second/notes.md", "fresh")]);
+        write_files(&target, &[("second/notes.md", "stale")]);
+
+        let fs = StdFileSystem::new();
+        let checksum = RecordingChecksum::default();
+        let diff = SkillDiffer::new(&fs, &checksum)
+            .compute_diff(&source, &target)
+            .await
+            .unwrap();
+
+        assert_eq!(diff.skills[0].name, "first");
+        assert_eq!(diff.skills[0].status, SkillStatus::Unchanged);
+        assert_eq!(diff.skills[1].name, "second");
+        assert_eq!(diff.skills[1].status, SkillStatus::Updated);
+        assert_eq!(diff.skills[1].modified_count(), 1);
+        assert_eq!(checksum.batch_sizes.into_inner().unwrap(), vec![8]);
+    }
 
     #[test]
     fn test_skill_diff_counts() {